@@ -0,0 +1,173 @@
+"""Runs the evaluation hot-path benchmarks and optionally compares them to a baseline.
+
+    python -m benchmarks [--quick] [--only resolver_get,load_configs]
+                         [--save-baseline benchmarks/baseline.json]
+                         [--compare benchmarks/baseline.json] [--tolerance 0.25]
+
+Every case runs offline against synthetic configs from benchmarks.synthetic at
+several scales: number of keys, allowlist size, segment depth, variants, etc.
+Each reports ops/sec and the largest peak allocation tracemalloc sees for a
+single operation, over up to ALLOCATION_BATCH operations. `--compare` exits
+non-zero when a case is more than `--tolerance` slower than the baseline.
+Baselines are machine specific, so refresh them with `--save-baseline` on the
+machine you compare on.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import prefab_pb2 as Prefab
+from benchmarks.synthetic import (
+    allowlist_flag,
+    build_client,
+    log_level_configs,
+    property_configs,
+    scalar_configs,
+    segment_chain,
+    weighted_values,
+)
+from prefab_cloud_python._processors import get_severity
+from prefab_cloud_python.config_client import ConfigClient
+from prefab_cloud_python.weighted_value_resolver import WeightTable
+
+ALLOCATION_BATCH = 1000
+
+
+def resolver_get(scale):
+    resolver = build_client(property_configs(scale)).config_client().config_resolver
+    keys = ["targeted.%s" % (index % scale) for index in range(ALLOCATION_BATCH)]
+    properties = {"plan": "enterprise"}
+    return lambda index: resolver.get(keys[index % ALLOCATION_BATCH], "user-%s" % index, properties)
+
+
+def resolver_resolve_constant(scale):
+    resolver = build_client(scalar_configs(scale)).config_client().config_resolver
+    keys = ["config.%s" % (index % scale) for index in range(ALLOCATION_BATCH)]
+    return lambda index: resolver.resolve(keys[index % ALLOCATION_BATCH], None)
+
+
+def criteria_evaluate_allowlist(scale):
+    client = build_client([allowlist_flag(1, "allowlisted", ["user-%s" % index for index in range(scale)])])
+    evaluator = client.config_client().config_resolver.snapshot.evaluators["allowlisted"]
+    return lambda index: evaluator.evaluate({"LOOKUP": "user-%s" % (index * 7 % (scale * 2))})
+
+
+def deep_segments(scale):
+    resolver = build_client(segment_chain(scale)).config_client().config_resolver
+    emails = ["someone@prefab.cloud", "someone@example.com"]
+    return lambda index: resolver.resolve("deep-segmented", "user-%s" % index, {"email": emails[index % 2]})
+
+
+def weighted_resolve(scale):
+    table = WeightTable(weighted_values(scale), "weighted")
+    return lambda index: table.resolve("user-%s" % index)
+
+
+def severity_lookup(scale):
+    config_client = build_client(log_level_configs(scale)).config_client()
+    locations = ["app.module%s.sub%s.handler" % (index % (scale // 10 + 1), index % 10) for index in range(ALLOCATION_BATCH)]
+    return lambda index: get_severity(locations[index % ALLOCATION_BATCH], config_client)
+
+
+def load_configs(scale):
+    configs = Prefab.Configs(
+        config_service_pointer=Prefab.ConfigServicePointer(project_id=1, project_env_id=1),
+        configs=property_configs(scale),
+    )
+    client = build_client()
+    return lambda _index: ConfigClient(client, timeout=5.0).load_configs(configs, "benchmark")
+
+
+CASES = {
+    "resolver_get": (resolver_get, [10, 1000, 50_000], [10, 1000]),
+    "resolver_resolve_constant": (resolver_resolve_constant, [10, 1000, 50_000], [10, 1000]),
+    "criteria_evaluate_allowlist": (criteria_evaluate_allowlist, [10, 1000, 50_000], [10, 1000]),
+    "deep_segments": (deep_segments, [1, 10, 50], [1, 10]),
+    "weighted_resolve": (weighted_resolve, [2, 10, 100], [2, 10]),
+    "severity_lookup": (severity_lookup, [10, 1000, 10_000], [10, 1000]),
+    "load_configs": (load_configs, [10, 1000, 50_000], [10, 1000]),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="smaller scales and a shorter run per case")
+    parser.add_argument("--only", default="", help="comma separated case names")
+    parser.add_argument("--min-time", type=float, default=None, help="seconds to run each case")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    min_time = args.min_time or (0.2 if args.quick else 1.0)
+    names = [name for name in args.only.split(",") if name] or list(CASES)
+    baseline = load_baseline(args.compare)
+
+    results = {}
+    regressions = []
+    print("%-40s %14s %14s %10s" % ("case", "ops/sec", "peak KiB/op", "vs base"))
+    for name in names:
+        (setup, scales, quick_scales) = CASES[name]
+        for scale in (quick_scales if args.quick else scales):
+            case = "%s[%s]" % (name, scale)
+            result = results[case] = run_case(setup(scale), min_time)
+            ratio = ""
+            if case in baseline:
+                change = result["ops_per_sec"] / baseline[case]["ops_per_sec"]
+                ratio = "%.2fx" % change
+                if change < 1 - args.tolerance:
+                    regressions.append(case)
+                    ratio += " !"
+            print("%-40s %14.1f %14.1f %10s" % (case, result["ops_per_sec"], result["peak_kib"], ratio))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    if regressions:
+        print("Slower than baseline by more than %d%%: %s" % (args.tolerance * 100, ", ".join(regressions)))
+        sys.exit(1)
+
+
+def run_case(operation, min_time):
+    operation(0)
+
+    iterations = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for index in range(iterations, iterations + batch):
+            operation(index)
+        iterations += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        batch = min(batch * 2, 100_000)
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for index in range(min(iterations, ALLOCATION_BATCH)):
+            tracemalloc.reset_peak()
+            (before, _peak) = tracemalloc.get_traced_memory()
+            operation(index)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": iterations / elapsed, "peak_kib": peak / 1024}
+
+
+def load_baseline(path):
+    if path is None:
+        return {}
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+if __name__ == "__main__":
+    main()
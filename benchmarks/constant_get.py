@@ -0,0 +1,48 @@
+"""Measures per-get latency for criteria-free configs.
+
+    python -m benchmarks.constant_get [--configs 1000] [--gets 200000]
+
+`constant` is ConfigResolver.resolve, which returns the value unwrapped when the
+snapshot was built. `evaluated` is the path every get took before: build an
+evaluation context, run the compiled evaluator and unwrap.
+`client_get` and `client_get_string` are the public generic and typed getters
+for the same keys.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import build_client, scalar_configs
+from prefab_cloud_python.evaluation_context import EvaluationContext
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", type=int, default=1000)
+    parser.add_argument("--gets", type=int, default=200_000)
+    args = parser.parse_args()
+
+    client = build_client(scalar_configs(args.configs))
+    resolver = client.config_client().config_resolver
+    keys = ["config.%d" % (index % args.configs) for index in range(args.gets)]
+
+    print("%18s %14s" % ("mode", "ns per get"))
+    report("constant", args.gets, lambda: [resolver.resolve(key, None) for key in keys])
+    report("evaluated", args.gets, lambda: [evaluated(resolver, key) for key in keys])
+    report("client_get", args.gets, lambda: [client.get(key) for key in keys])
+    report("client_get_string", args.gets, lambda: [client.get_string(key) for key in keys])
+
+
+def evaluated(resolver, key):
+    context = EvaluationContext(resolver.snapshot, None)
+    evaluator = context.snapshot.evaluators[key]
+    return evaluator.unwrap(evaluator.evaluate(context.properties, context), context.properties)
+
+
+def report(mode, gets, run):
+    start = time.perf_counter()
+    run()
+    print("%18s %14.0f" % (mode, (time.perf_counter() - start) / gets * 1e9))
+
+
+if __name__ == "__main__":
+    main()
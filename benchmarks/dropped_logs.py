@@ -0,0 +1,45 @@
+"""Measures the per-call cost of log statements that are filtered out by level.
+
+    python -m benchmarks.dropped_logs [--calls 100000]
+
+`early_filter` is LoggerClient.debug(), which checks the caller's level before
+touching structlog. `processor_chain` sends the same event through the bound
+structlog logger, where it is only dropped by log_or_drop after timestamping
+and callsite inspection.
+"""
+import argparse
+import time
+
+import structlog
+from benchmarks.synthetic import build_client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    client = build_client()
+    client.config_client()
+    logger = client.logger()
+
+    def early_filter():
+        logger.debug("dropped")
+
+    def processor_chain():
+        try:
+            logger.configured_logger().debug("dropped")
+        except structlog.DropEvent:
+            pass
+
+    print("%-16s %14s" % ("path", "ns/call"))
+    for (name, log) in [("early_filter", early_filter), ("processor_chain", processor_chain)]:
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            log()
+        elapsed = time.perf_counter() - start
+        print("%-16s %14.0f" % (name, elapsed / args.calls * 1e9))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Measures the cost of applying a streamed one-config delta as the store grows.
+
+    python -m benchmarks.incremental_update [--sizes 100,1000,10000,50000]
+
+`incremental` is ConfigResolver.update(), which recompiles only changed keys.
+`full_rebuild` is make_local(), which re-merges and recompiles everything.
+"""
+import argparse
+import time
+
+import prefab_pb2 as Prefab
+from benchmarks.synthetic import build_client, scalar_config, scalar_configs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000,50000")
+    parser.add_argument("--updates", type=int, default=50)
+    args = parser.parse_args()
+
+    print("%10s %18s %18s" % ("configs", "incremental (ms)", "full_rebuild (ms)"))
+    for size in [int(size) for size in args.sizes.split(",")]:
+        client = build_client(scalar_configs(size))
+        config_client = client.config_client()
+        resolver = config_client.config_resolver
+        next_id = size + 1
+
+        incremental = []
+        full_rebuild = []
+        for _ in range(args.updates):
+            delta = Prefab.Configs(configs=[scalar_config(next_id, "config.0", "value-%s" % next_id)])
+            next_id += 1
+            start = time.perf_counter()
+            config_client.load_configs(delta, "benchmark")
+            incremental.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            resolver.make_local()
+            full_rebuild.append(time.perf_counter() - start)
+
+        print("%10d %18.3f %18.3f" % (size, median(incremental) * 1000, median(full_rebuild) * 1000))
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+if __name__ == "__main__":
+    main()
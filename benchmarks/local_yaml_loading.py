@@ -0,0 +1,59 @@
+"""Measures loading a tree of local YAML config files.
+
+    python -m benchmarks.local_yaml_loading [--files 8] [--keys-per-file 20000]
+
+`dict_union` is the old merge, `rtn = rtn | data` per file. `streaming` merges
+each file's (key, config) pairs in place, and `process_pool`
+(`Options(parallel_local_loading=True)`) additionally parses the files in
+parallel worker processes.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import build_client, write_yaml_tree
+from prefab_cloud_python import config_loader
+from prefab_cloud_python.yaml_parser import YamlParser
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--keys-per-file", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="prefab-yaml-") as directory:
+        envs = ["env%d" % index for index in range(args.files - 1)]
+        write_yaml_tree(directory, envs, args.keys_per_file)
+        files = ["%s/.prefab.%s.config.yaml" % (directory, env) for env in ["default", *envs]]
+
+        print("%d files, %d keys each, %d cpus" % (len(files), args.keys_per_file, os.cpu_count() or 1))
+        print("%14s %10s %8s" % ("mode", "seconds", "keys"))
+        report("dict_union", lambda: dict_union(files))
+        report("streaming", lambda: load(directory, envs, parallel=False))
+        report("process_pool", lambda: load(directory, envs, parallel=True))
+
+
+def report(mode, load):
+    start = time.perf_counter()
+    loaded = load()
+    print("%14s %10.3f %8d" % (mode, time.perf_counter() - start, len(loaded)))
+
+
+def dict_union(files):
+    rtn = {}
+    for file in files:
+        rtn = rtn | YamlParser(file).data
+    return rtn
+
+
+def load(directory, envs, parallel):
+    config_loader.PARALLEL_MIN_FILES = 1
+    config_loader.PARALLEL_MIN_BYTES = 0
+    client = build_client(prefab_config_classpath_dir=directory, prefab_envs=list(envs), parallel_local_loading=parallel)
+    return config_loader.ConfigLoader(client).classpath_config
+
+
+if __name__ == "__main__":
+    main()
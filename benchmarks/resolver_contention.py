@@ -0,0 +1,81 @@
+"""Measures ConfigResolver read throughput as reader threads are added.
+
+    python -m benchmarks.resolver_contention [--threads 1,2,4,8] [--seconds 2]
+
+`snapshot` is the current lock-free read path. `read_write_lock` wraps the same
+read in the ReadWriteLock the resolver used to take, to show what that costs.
+A background writer rebuilds and republishes the snapshot periodically in
+both modes, using make_local because update() skips publishing when nothing
+changed.
+"""
+import argparse
+import threading
+import time
+
+from prefab_cloud_python.read_write_lock import ReadWriteLock
+from benchmarks.synthetic import build_client, scalar_configs, allowlist_flag
+
+BATCH = 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--updates-per-second", type=float, default=10.0)
+    args = parser.parse_args()
+
+    client = build_client(scalar_configs(1_000) + [allowlist_flag(10_000, "flag", ["user:%s" % i for i in range(100)])])
+    resolver = client.config_client().config_resolver
+    lock = ReadWriteLock()
+
+    def snapshot_read():
+        resolver.get("flag", "user:1")
+
+    def locked_read():
+        lock.acquire_read()
+        evaluator = resolver.snapshot.evaluators.get("flag")
+        lock.release_read()
+        evaluator.evaluate({"LOOKUP": "user:1"})
+
+    def locked_update():
+        lock.acquire_write()
+        resolver.make_local()
+        lock.release_write()
+
+    print("%-16s %8s %14s %12s" % ("mode", "threads", "ops/sec", "per-thread"))
+    for (mode, read, update) in [("snapshot", snapshot_read, resolver.make_local), ("read_write_lock", locked_read, locked_update)]:
+        for thread_count in [int(count) for count in args.threads.split(",")]:
+            ops = measure(read, update, thread_count, args.seconds, args.updates_per_second)
+            print("%-16s %8d %14.0f %12.0f" % (mode, thread_count, ops, ops / thread_count))
+
+
+def measure(read, update, thread_count, seconds, updates_per_second):
+    deadline = time.perf_counter() + seconds
+    counts = [0] * thread_count
+
+    def reader(index):
+        count = 0
+        while time.perf_counter() < deadline:
+            for _ in range(BATCH):
+                read()
+            count += BATCH
+        counts[index] = count
+
+    def writer():
+        while time.perf_counter() < deadline:
+            update()
+            time.sleep(1 / updates_per_second)
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(thread_count)]
+    if updates_per_second > 0:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Synthetic configs and clients shared by the benchmarks."""
+import tempfile
+
+import prefab_pb2 as Prefab
+from prefab_cloud_python import Options, Client
+
+EMPTY_CONFIG_DIR = tempfile.TemporaryDirectory(prefix="prefab-benchmarks-")
+
+
+def build_client(configs=(), **options):
+    options = Options(**{
+        "prefab_config_classpath_dir": EMPTY_CONFIG_DIR.name,
+        "prefab_config_override_dir": EMPTY_CONFIG_DIR.name,
+        "prefab_datasources": "LOCAL_ONLY",
+        **options,
+    })
+    client = Client(options)
+    if configs:
+        client.config_client().load_configs(Prefab.Configs(configs=configs), "benchmark")
+    return client
+
+
+def scalar_config(id, key, value):
+    return Prefab.Config(
+        id=id,
+        key=key,
+        config_type="CONFIG",
+        rows=[Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string=value))])],
+    )
+
+
+def allowlist_flag(id, key, lookup_keys):
+    return Prefab.Config(
+        id=id,
+        key=key,
+        config_type="FEATURE_FLAG",
+        rows=[
+            Prefab.ConfigRow(
+                values=[
+                    Prefab.ConditionalValue(
+                        criteria=[
+                            Prefab.Criterion(
+                                operator="LOOKUP_KEY_IN",
+                                property_name="LOOKUP",
+                                value_to_match=Prefab.ConfigValue(string_list=Prefab.StringList(values=lookup_keys)),
+                            )
+                        ],
+                        value=Prefab.ConfigValue(bool=True),
+                    ),
+                    Prefab.ConditionalValue(value=Prefab.ConfigValue(bool=False)),
+                ]
+            )
+        ],
+    )
+
+
+def scalar_configs(count, start_id=1):
+    return [scalar_config(start_id + i, "config.%s" % i, "value-%s" % i) for i in range(count)]
+
+
+def write_yaml_tree(directory, envs, keys_per_file):
+    "Writes `.prefab.<env>.config.yaml` for default plus each env, with overlapping nested keys."
+    for (file_index, env) in enumerate(["default", *envs]):
+        lines = []
+        for group in range(keys_per_file // 10):
+            lines.append("group%d:" % group)
+            for key in range(10):
+                lines.append("  key%d: value-%d-%d-%d" % (key, file_index, group, key))
+        with open("%s/.prefab.%s.config.yaml" % (directory, env), "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+def property_config(id, key, property_name, values):
+    return Prefab.Config(
+        id=id,
+        key=key,
+        config_type="CONFIG",
+        rows=[
+            Prefab.ConfigRow(
+                values=[
+                    Prefab.ConditionalValue(
+                        criteria=[
+                            Prefab.Criterion(
+                                operator="PROP_IS_ONE_OF",
+                                property_name=property_name,
+                                value_to_match=Prefab.ConfigValue(string_list=Prefab.StringList(values=values)),
+                            )
+                        ],
+                        value=Prefab.ConfigValue(string="matched"),
+                    ),
+                    Prefab.ConditionalValue(value=Prefab.ConfigValue(string="default")),
+                ]
+            )
+        ],
+    )
+
+
+def property_configs(count, start_id=1):
+    return [property_config(start_id + i, "targeted.%s" % i, "plan", ["enterprise", "plan-%s" % i]) for i in range(count)]
+
+
+def segment_chain(depth, start_id=1):
+    "Segments `segment.0` .. `segment.<depth - 1>`, each nested in the previous one, and a flag on the deepest."
+    configs = [
+        Prefab.Config(
+            id=start_id,
+            key="segment.0",
+            config_type="SEGMENT",
+            rows=[Prefab.ConfigRow(values=[
+                Prefab.ConditionalValue(
+                    criteria=[Prefab.Criterion(
+                        operator="PROP_ENDS_WITH_ONE_OF",
+                        property_name="email",
+                        value_to_match=Prefab.ConfigValue(string_list=Prefab.StringList(values=["@prefab.cloud"])),
+                    )],
+                    value=Prefab.ConfigValue(bool=True),
+                ),
+                Prefab.ConditionalValue(value=Prefab.ConfigValue(bool=False)),
+            ])],
+        )
+    ]
+    for level in range(1, depth + 1):
+        key = "segment.%s" % level if level < depth else "deep-segmented"
+        configs.append(Prefab.Config(
+            id=start_id + level,
+            key=key,
+            config_type="SEGMENT" if level < depth else "FEATURE_FLAG",
+            rows=[Prefab.ConfigRow(values=[
+                Prefab.ConditionalValue(
+                    criteria=[Prefab.Criterion(operator="IN_SEG", value_to_match=Prefab.ConfigValue(string="segment.%s" % (level - 1)))],
+                    value=Prefab.ConfigValue(bool=True),
+                ),
+                Prefab.ConditionalValue(value=Prefab.ConfigValue(bool=False)),
+            ])],
+        ))
+    return configs
+
+
+def weighted_values(variants):
+    return [
+        Prefab.WeightedValue(weight=1000 // variants, value=Prefab.ConfigValue(string="variant-%s" % index))
+        for index in range(variants)
+    ]
+
+
+def log_level_configs(count, start_id=1):
+    levels = ["DEBUG", "INFO", "WARN", "ERROR"]
+    return [
+        Prefab.Config(
+            id=start_id + i,
+            key="log-level.app.module%s.sub%s" % (i // 10, i % 10),
+            config_type="LOG_LEVEL",
+            rows=[Prefab.ConfigRow(values=[
+                Prefab.ConditionalValue(value=Prefab.ConfigValue(log_level=levels[i % len(levels)]))
+            ])],
+        )
+        for i in range(count)
+    ]
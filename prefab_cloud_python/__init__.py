@@ -1,2 +1,9 @@
 from .client import Client
 from .options import Options
+
+
+def __getattr__(name):
+    if name == "AsyncClient":
+        from .async_client import AsyncClient
+        return AsyncClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
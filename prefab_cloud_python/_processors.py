@@ -1,9 +1,11 @@
 import prefab_pb2 as Prefab
+import functools
 import re
 import os
-from structlog import DropEvent
 
 LOG_LEVEL_BASE_KEY = "log-level"
+PATH_CACHE_SIZE = 4096
+PYTHON_EXTENSION = re.compile(r"\.pyc?$")
 
 LLV = Prefab.LogLevel.Value
 
@@ -35,7 +37,8 @@ def clean_event_dict(_, __, event_dict):
 
 
 def set_location(_, __, event_dict):
-    event_dict["location"] = get_path(event_dict["pathname"], event_dict["func_name"], event_dict["log_prefix"])
+    if "location" not in event_dict:
+        event_dict["location"] = get_path(event_dict["pathname"], event_dict["func_name"], event_dict["log_prefix"])
     return event_dict
 
 
@@ -46,12 +49,17 @@ def log_or_drop(_, method, event_dict):
     called_method_level = python_to_prefab_log_levels[method]
 
     if closest_log_level > called_method_level:
+        from structlog import DropEvent
         raise DropEvent
 
     return event_dict
 
 
 def get_severity(location, config_client):
+    return config_client.severity_for(location)
+
+
+def find_severity(location, config_client):
     default = Prefab.LogLevel.Value("WARN")
     closest_log_level = config_client.get(LOG_LEVEL_BASE_KEY, default=default)
 
@@ -65,16 +73,26 @@ def get_severity(location, config_client):
 
 
 def get_path(path, func_name, prefix=None):
+    return derive_path(path, func_name, prefix, os.environ.get("HOME"))
+
+
+def get_path_cache_info():
+    return derive_path.cache_info()
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def derive_path(path, func_name, prefix, home):
     if "site-packages" in path:
         path = path.split("site-packages/")[-1]
     else:
-        path = path.replace(os.environ.get("HOME") + "/", "")
+        if home is not None:
+            path = path.replace(home + "/", "")
         path = path.split("/")[-3:]
         path = ".".join(path)
 
     path = path.lower()
-    path = re.sub(".pyc?$", "", path)
-    path = re.sub("-", "_", path)
+    path = PYTHON_EXTENSION.sub("", path)
+    path = path.replace("-", "_")
 
     if isinstance(prefix, str):
         return "%s.%s.%s" % (prefix, path, func_name)
@@ -0,0 +1,156 @@
+import asyncio
+import functools
+
+import prefab_pb2 as Prefab
+
+from .base_config_client import BaseConfigClient, InitializationTimeoutException
+from .client import Client
+from .config_loader import ConfigLoader
+from .config_resolver import ConfigResolver
+from .feature_flag_client import FeatureFlagClient
+from .logger_client import LoggerClient
+
+
+class AsyncClient(BaseConfigClient):
+    "Client for asyncio services: loads configs in background tasks and serves get/enabled without blocking"
+
+    max_sleep_sec = Client.max_sleep_sec
+    base_sleep_sec = Client.base_sleep_sec
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.namespace = options.namespace
+        self.tasks = []
+        self.channel = None
+        self.is_ready = asyncio.Event()
+        self.config_loader = ConfigLoader(self)
+        self.config_resolver = ConfigResolver(self, self.config_loader)
+        self.feature_flags = FeatureFlagClient(self)
+        self.logger().set_config_client(self)
+
+    async def ready(self):
+        self.start()
+        try:
+            await asyncio.wait_for(self.is_ready.wait(), self.options.connection_timeout_seconds)
+        except asyncio.TimeoutError:
+            if self.options.on_connection_failure == "RAISE":
+                raise InitializationTimeoutException(self.options.connection_timeout_seconds, "ready")
+            self.logger().warn(f"Couldn't initialize in {self.options.connection_timeout_seconds}. Returning what we have.")
+
+    def start(self):
+        if self.tasks or self.is_ready.is_set():
+            return
+        if self.options.is_local_only():
+            self.finish_init("local only")
+            return
+        if self.options.is_shared_cache_only():
+            self.load_shared_cache()
+            self.tasks = [asyncio.create_task(self.shared_cache_loop())]
+            return
+        self.load_checkpoint_from_cache()
+        self.tasks = [
+            asyncio.create_task(self.checkpointing_loop()),
+            asyncio.create_task(self.grpc_stream()),
+        ]
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.channel is not None:
+            await self.channel.close()
+            self.channel = None
+        self.stream_state = "closed"
+        await asyncio.to_thread(self.flush_checkpoint_cache)
+
+    def call_later(self, delay, callback):
+        asyncio.get_running_loop().call_later(delay, lambda: self.tasks.append(asyncio.create_task(asyncio.to_thread(callback))))
+
+    def get(self, key, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        value = self.config_resolver.resolve(key, lookup_key, properties)
+        if value is not None:
+            return value
+        if self.is_ff(key):
+            return None if default == "NO_DEFAULT_PROVIDED" else default
+        return self.handle_default(key, default)
+
+    def enabled(self, feature_name, lookup_key=None, attributes={}):
+        variant = self.config_resolver.resolve(feature_name, lookup_key, attributes)
+        return self.feature_flags.is_on(variant)
+
+    def is_ff(self, key):
+        raw = self.config_resolver.raw(key)
+        return raw is not None and raw.config_type == Prefab.ConfigType.Value("FEATURE_FLAG")
+
+    def severity_for(self, location):
+        return self.config_resolver.severity_for(location)
+
+    async def checkpointing_loop(self):
+        failures = 0
+        while True:
+            try:
+                failures = 0 if await self.load_checkpoint_from_api_cdn() else failures + 1
+            except Exception as ex:
+                failures += 1
+                self.logger().info(f"Issue Checkpointing: {ex}")
+            await asyncio.sleep(self.checkpoint_delay(failures))
+
+    async def load_checkpoint_from_api_cdn(self):
+        response = await asyncio.to_thread(self.http_pool().request, "GET", self.cdn_url(), headers=self.cdn_headers())
+        return self.handle_cdn_response(response)
+
+    async def shared_cache_loop(self):
+        while True:
+            await asyncio.sleep(self.shared_cache_poll_secs)
+            try:
+                if self.shared_cache_changed():
+                    self.load_shared_cache()
+            except Exception as ex:
+                self.logger().warn(f"Issue reading shared cache {self.shared_cache.path}: {ex}")
+
+    async def grpc_stream(self):
+        import prefab_pb2_grpc as PrefabGrpc
+        failures = 0
+        while True:
+            self.stream_state = "connecting"
+            try:
+                req = Prefab.ConfigServicePointer(start_at_id=self.config_loader.highwater_mark)
+                stub = PrefabGrpc.ConfigServiceStub(self.grpc_channel())
+                async for resp in stub.GetConfig(req, metadata=[("auth", self.options.api_key)]):
+                    self.stream_state = "connected"
+                    failures = 0
+                    self.load_configs(resp, "remote_api_grpc_stream")
+                self.logger().info("gRPC config stream ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                self.logger().warn(f"gRPC config stream failed: {ex}")
+            failures += 1
+            self.stream_reconnects += 1
+            self.stream_state = "reconnecting"
+            await asyncio.sleep(self.reconnect_delay(failures))
+
+    def finish_init(self, source):
+        if self.is_ready.is_set():
+            return
+        self.logger().info(f"Unlocked config via {source}")
+        self.is_ready.set()
+
+    def grpc_channel(self):
+        import grpc
+        if self.channel is None:
+            if self.options.http_secure:
+                self.channel = grpc.aio.secure_channel(self.options.prefab_grpc_url, grpc.ssl_channel_credentials())
+            else:
+                self.channel = grpc.aio.insecure_channel(self.options.prefab_grpc_url)
+        return self.channel
+
+    @functools.cache
+    def http_pool(self):
+        import urllib3
+        return urllib3.PoolManager(timeout=self.options.connection_timeout_seconds)
+
+    @functools.cache
+    def logger(self):
+        return LoggerClient(self.options.log_prefix)
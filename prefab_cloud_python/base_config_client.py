@@ -0,0 +1,169 @@
+from .checkpoint_cache import CheckpointCache
+
+import base64
+import random
+import threading
+import prefab_pb2 as Prefab
+
+CHECKPOINT_CACHE_SOURCE = "checkpoint_cache"
+SHARED_CACHE_SOURCE = "shared_cache"
+
+
+class InitializationTimeoutException(Exception):
+    def __init__(self, timeout_seconds, key):
+        super().__init__(f"Prfeab couldn't initialize in {timeout_seconds} second timeout. Trying to fetch key `{key}`.")
+
+
+class MissingDefaultException(Exception):
+    def __init__(self, key):
+        super().__init__(f"""No value found for key '{key}' and no default was provided.
+
+If you'd prefer returning `None` rather than raising when this occurs, modify the `on_no_default` value you provide in your Options.""")
+
+
+class BaseConfigClient:
+    "Checkpoint, cache and default handling shared by ConfigClient and AsyncClient"
+
+    def __init__(self, options):
+        self.options = options
+        self.checkpoint_freq_secs = 60
+        self.checkpoint_live_stream_freq_secs = 600
+        self.checkpoint_max_backoff_secs = 600
+        self.stream_state = "disconnected"
+        self.stream_reconnects = 0
+        self.cdn_etag = None
+        self.cdn_last_modified = None
+        self.checkpoint_cache = None
+        self.shared_cache = None
+        self.shared_cache_poll_secs = 1
+        self.shared_cache_highwater_mark = None
+        self.cache_write_delay_secs = 1
+        self.cache_write_lock = threading.Lock()
+        self.pending_cache_write = None
+        if options.shared_cache:
+            self.shared_cache = CheckpointCache(options.shared_cache, options.api_key)
+        if options.checkpoint_cache_path and not options.is_shared_cache_only():
+            self.checkpoint_cache = CheckpointCache(options.checkpoint_cache_path, options.api_key)
+
+    def handle_default(self, key, default):
+        if default != "NO_DEFAULT_PROVIDED":
+            return default
+        if self.options.on_no_default == "RAISE":
+            raise MissingDefaultException(key)
+        return None
+
+    def checkpoint_delay(self, failures):
+        if failures > 0:
+            return min(self.checkpoint_freq_secs * 2 ** (failures - 1), self.checkpoint_max_backoff_secs)
+        if self.stream_state == "connected":
+            return self.checkpoint_live_stream_freq_secs
+        return self.checkpoint_freq_secs
+
+    def reconnect_delay(self, failures):
+        delay = min(self.max_sleep_sec, self.base_sleep_sec * 2 ** (failures - 1))
+        return random.uniform(delay / 2, delay)
+
+    def cdn_url(self):
+        return "%s/api/v1/configs/0" % self.options.url_for_api_cdn
+
+    def cdn_headers(self):
+        auth = "%s:%s" % ("authuser", self.options.api_key)
+        token = base64.b64encode(auth.encode("utf-8")).decode("ascii")
+        headers = {"Authorization": "Basic %s" % token, "Accept-Encoding": "gzip"}
+        if self.cdn_etag is not None:
+            headers["If-None-Match"] = self.cdn_etag
+        if self.cdn_last_modified is not None:
+            headers["If-Modified-Since"] = self.cdn_last_modified
+        return headers
+
+    def handle_cdn_response(self, response):
+        if response.status == 304:
+            self.logger().debug("Checkpoint remote_cdn_api unchanged")
+            return True
+        elif response.status == 200:
+            self.load_configs(Prefab.Configs.FromString(response.data), "remote_api_cdn")
+            self.cdn_etag = response.headers.get("ETag")
+            self.cdn_last_modified = response.headers.get("Last-Modified")
+            return True
+        else:
+            self.logger().info(f"Checkpoint remote_cdn_api failed to load. Response {response.status}")
+            return False
+
+    def published_caches(self):
+        "The checkpoint cache and, unless this client is a subscriber, the shared snapshot it publishes"
+        if self.options.is_shared_cache_only():
+            return []
+        return [cache for cache in (self.checkpoint_cache, self.shared_cache) if cache is not None]
+
+    def load_checkpoint_from_cache(self):
+        for cache in self.published_caches():
+            configs = cache.load(self.config_resolver.project_env_id)
+            if configs is None:
+                self.logger().info(f"No usable checkpoint cache at {cache.path}")
+                continue
+            self.load_configs(configs, CHECKPOINT_CACHE_SOURCE)
+            return True
+        return False
+
+    def queue_checkpoint_save(self, config_service_pointer):
+        "Writes the caches at most once per cache_write_delay_secs, so a busy stream doesn't reserialize every config per delta"
+        if not self.published_caches():
+            return
+        with self.cache_write_lock:
+            scheduled = self.pending_cache_write is not None
+            self.pending_cache_write = config_service_pointer
+        if not scheduled:
+            self.call_later(self.cache_write_delay_secs, self.flush_checkpoint_cache)
+
+    def flush_checkpoint_cache(self):
+        with self.cache_write_lock:
+            config_service_pointer = self.pending_cache_write
+            self.pending_cache_write = None
+        if config_service_pointer is not None:
+            self.save_checkpoint_to_cache(config_service_pointer)
+
+    def save_checkpoint_to_cache(self, config_service_pointer):
+        highwater_mark = self.config_loader.highwater_mark
+        configs = None
+        for cache in self.published_caches():
+            if cache.highwater_mark() == highwater_mark:
+                continue
+            if configs is None:
+                configs = self.config_loader.get_api_deltas()
+                configs.config_service_pointer.CopyFrom(config_service_pointer)
+                configs.config_service_pointer.start_at_id = highwater_mark
+            try:
+                cache.save(configs, highwater_mark)
+            except OSError as ex:
+                self.logger().warn(f"Unable to write checkpoint cache {cache.path}: {ex}")
+
+    def shared_cache_changed(self):
+        return self.shared_cache.highwater_mark() != self.shared_cache_highwater_mark
+
+    def load_shared_cache(self):
+        configs = self.shared_cache.load()
+        if configs is None:
+            self.logger().info(f"No usable shared cache at {self.shared_cache.path}")
+            return False
+        shared_keys = {config.key for config in configs.configs}
+        for key in self.config_loader.api_config.keys() - shared_keys:
+            self.config_loader.remove(key)
+        self.shared_cache_highwater_mark = configs.config_service_pointer.start_at_id
+        self.load_configs(configs, SHARED_CACHE_SOURCE)
+        return True
+
+    def load_configs(self, configs, source):
+        project_id = configs.config_service_pointer.project_id
+        project_env_id = configs.config_service_pointer.project_env_id
+        self.config_resolver.project_env_id = project_env_id
+        starting_highwater_mark = self.config_loader.highwater_mark
+        for config in configs.configs:
+            self.config_loader.set(config, source)
+        if self.config_loader.highwater_mark > starting_highwater_mark:
+            self.logger().info(f"Found new checkpoint with highwater id {self.config_loader.highwater_mark} from {source} in project {project_id} environment: {project_env_id} and namespace {self.options.namespace}")
+        else:
+            self.logger().debug(f"Checkpoint with highwater id {self.config_loader.highwater_mark} from {source}. No changes.")
+        self.config_resolver.update()
+        self.finish_init(source)
+        if source != SHARED_CACHE_SOURCE and self.config_loader.highwater_mark > starting_highwater_mark:
+            self.queue_checkpoint_save(configs.config_service_pointer)
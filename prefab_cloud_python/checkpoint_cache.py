@@ -0,0 +1,63 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+import prefab_pb2 as Prefab
+from google.protobuf.message import DecodeError
+
+MAGIC = b"PFB2"
+HEADER = struct.Struct("<4sQq32sQ")
+
+
+class CheckpointCache:
+    "Persists the last good checkpoint so a client can serve configs before the network answers"
+
+    def __init__(self, path, api_key=None):
+        self.path = path
+        self.key_digest = None if api_key is None else hashlib.sha256(api_key.encode("utf-8")).digest()
+
+    def load(self, project_env_id=None):
+        "Returns None unless the file was written for this API key and, when given, this project environment"
+        try:
+            with open(self.path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self.parse(data, project_env_id)
+        except (OSError, ValueError, struct.error, DecodeError):
+            return None
+
+    def highwater_mark(self):
+        try:
+            with open(self.path, "rb") as file:
+                (magic, highwater_mark, _project_env_id, _key_digest, _length) = HEADER.unpack(file.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        if magic != MAGIC:
+            return None
+        return highwater_mark
+
+    def parse(self, data, project_env_id=None):
+        (magic, _highwater_mark, cached_project_env_id, key_digest, length) = HEADER.unpack_from(data)
+        if magic != MAGIC or HEADER.size + length > len(data):
+            return None
+        if self.key_digest is not None and key_digest != self.key_digest:
+            return None
+        if project_env_id and project_env_id != cached_project_env_id:
+            return None
+        with memoryview(data)[HEADER.size:HEADER.size + length] as payload:
+            return Prefab.Configs.FromString(payload)
+
+    def save(self, configs, highwater_mark):
+        payload = configs.SerializeToString()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        (fd, temp_path) = tempfile.mkstemp(dir=directory, prefix=".prefab-checkpoint-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                project_env_id = configs.config_service_pointer.project_env_id
+                file.write(HEADER.pack(MAGIC, highwater_mark, project_env_id, self.key_digest or bytes(32), len(payload)))
+                file.write(payload)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -17,6 +17,8 @@ class Client:
         self.grpc_url = options.prefab_grpc_url
         if options.is_local_only():
             self.logger().info("Prefab running in local-only mode")
+        elif options.is_shared_cache_only():
+            self.logger().info("Prefab reading configs from shared cache %s" % options.shared_cache)
         else:
             self.logger().info("Prefab connecting to %s and %s, secure %s" %
                                (options.prefab_api_url, options.prefab_grpc_url, options.http_secure))
@@ -29,6 +31,31 @@ class Client:
         else:
             return self.config_client().get(key, default=default, properties=properties, lookup_key=lookup_key)
 
+    def get_int(self, key, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        return self.config_client().get_typed(key, "int", default, properties, lookup_key)
+
+    def get_bool(self, key, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        return self.config_client().get_typed(key, "bool", default, properties, lookup_key)
+
+    def get_string(self, key, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        return self.config_client().get_typed(key, "string", default, properties, lookup_key)
+
+    def get_float(self, key, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        return self.config_client().get_typed(key, "double", default, properties, lookup_key)
+
+    def get_many(self, keys, default="NO_DEFAULT_PROVIDED", lookup_key=None, properties={}):
+        keys = list(keys)
+        config_client = self.config_client()
+        values = config_client.resolve_many(keys, properties=properties, lookup_key=lookup_key)
+        for (key, value) in values.items():
+            if value is not None:
+                continue
+            if self.is_ff(key):
+                values[key] = None if default == "NO_DEFAULT_PROVIDED" else default
+            else:
+                values[key] = config_client.handle_default(key, default)
+        return values
+
     def enabled(self, feature_name, lookup_key=None, attributes={}):
         return self.feature_flag_client().feature_is_on_for(feature_name, lookup_key, attributes)
 
@@ -38,6 +65,9 @@ class Client:
             return True
         return False
 
+    def close(self):
+        self.config_client().close()
+
     @functools.cache
     def config_client(self):
         client = ConfigClient(self, timeout=5.0)
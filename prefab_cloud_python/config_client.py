@@ -1,155 +1,203 @@
+from .base_config_client import BaseConfigClient, InitializationTimeoutException, MissingDefaultException
 from .config_loader import ConfigLoader
 from .config_resolver import ConfigResolver
-from .read_write_lock import ReadWriteLock
-from .config_value_unwrapper import ConfigValueUnwrapper
 
-import grpc
 import threading
-import time
-import urllib3
-import base64
 import prefab_pb2 as Prefab
-import prefab_pb2_grpc as PrefabGrpc
-import concurrent.futures
 import functools
 
-class InitializationTimeoutException(Exception):
-    def __init__(self, timeout_seconds, key):
-        super().__init__(f"Prfeab couldn't initialize in {timeout_seconds} second timeout. Trying to fetch key `{key}`.")
 
-
-class MissingDefaultException(Exception):
-    def __init__(self, key):
-        super().__init__(f"""No value found for key '{key}' and no default was provided.
-
-If you'd prefer returning `None` rather than raising when this occurs, modify the `on_no_default` value you provide in your Options.""")
-
-
-class ConfigClient:
+class ConfigClient(BaseConfigClient):
     def __init__(self, base_client, timeout):
         base_client.logger().info("Initializing ConfigClient")
+        super().__init__(base_client.options)
         self.base_client = base_client
-        self.options = base_client.options
         self.timeout = timeout
 
-        self.stream_lock = ReadWriteLock()
-        self.init_lock = ReadWriteLock()
+        self.is_ready = False
+        self.init_event = threading.Event()
 
-        self.checkpoint_freq_secs = 60
+        self.stream = None
+        self.shutdown_event = threading.Event()
 
         self.config_loader = ConfigLoader(base_client)
         self.config_resolver = ConfigResolver(base_client, self.config_loader)
 
-        self.base_client.logger().debug("Initialize ConfigClient: acquire write lock")
-        self.init_lock.acquire_write()
-        self.base_client.logger().debug("Initialize ConfigClient: acquired write lock")
-        self.init_future = concurrent.futures.ThreadPoolExecutor().submit(lambda: self.init_lock.acquire_read())
-
         if self.options.is_local_only():
             self.finish_init("local only")
+        elif self.options.is_shared_cache_only():
+            self.load_shared_cache()
+            self.start_shared_cache_thread()
         else:
-            self.load_checkpoint()
-            self.start_checkpointing_thread()
+            loaded_from_network = not self.load_checkpoint_from_cache() and self.load_checkpoint()
+            self.start_checkpointing_thread(poll_first=not loaded_from_network)
             self.start_streaming()
 
     def get(self, key, default="NO_DEFAULT_PROVIDED", properties={}, lookup_key=None):
         value = self.__get(key, lookup_key, properties)
         if value is not None:
-            return ConfigValueUnwrapper.unwrap(value, key, properties)
+            return value
         else:
             return self.handle_default(key, default)
 
+    def get_typed(self, key, value_type, default="NO_DEFAULT_PROVIDED", properties={}, lookup_key=None):
+        self.__await_init(key)
+        value = self.config_resolver.resolve_typed(key, value_type, lookup_key, properties)
+        if value is not None:
+            return value
+        raw = self.config_resolver.raw(key)
+        if raw is not None and raw.config_type == Prefab.ConfigType.Value("FEATURE_FLAG"):
+            return None if default == "NO_DEFAULT_PROVIDED" else default
+        return self.handle_default(key, default)
+
+    def resolve_many(self, keys, properties={}, lookup_key=None):
+        if not self.is_ready:
+            self.__await_init(", ".join(keys))
+        return self.config_resolver.resolve_many(keys, lookup_key, properties)
+
+    def resolve_bulk(self, key, lookup_keys, properties={}):
+        self.__await_init(key)
+        return self.config_resolver.resolve_bulk(key, lookup_keys, properties)
+
     def __get(self, key, lookup_key, properties):
-        self.init_future.result(self.options.connection_timeout_seconds)
-        if not self.init_future.done():
+        self.__await_init(key)
+        return self.config_resolver.resolve(key, lookup_key, properties)
+
+    def __await_init(self, key):
+        if self.is_ready:
+            return
+        if not self.init_event.wait(self.options.connection_timeout_seconds):
             if self.options.on_connection_failure == "RAISE":
                 raise InitializationTimeoutException(self.options.connection_timeout_seconds, key)
             self.base_client.logger().warn(f"Couldn't initialize in {self.options.connection_timeout_seconds}. Key {key}. Returning what we have.")
-            self.init_lock.release_write()
-        return self.config_resolver.get(key, lookup_key, properties)
+            self.finish_init("timeout")
 
-    def handle_default(self, key, default):
-        if default != "NO_DEFAULT_PROVIDED":
-            return default
-        if self.options.on_no_default == "RAISE":
-            raise MissingDefaultException(key)
-        return None
+    def severity_for(self, location):
+        return self.config_resolver.severity_for(location)
 
     def load_checkpoint(self):
         if self.load_checkpoint_from_api_cdn():
-            return
+            return True
         self.base_client.logger().info("load_checkpoint: fallback to GRPC API")
         if self.load_checkpoint_from_grpc_api():
-            return
+            return True
         self.base_client.logger().warn("No success loading checkpoints")
+        return False
 
-    def start_checkpointing_thread(self):
-        threading.Thread(target=self.checkpointing_loop).start()
+    def start_checkpointing_thread(self, poll_first=False):
+        threading.Thread(target=self.checkpointing_loop, args=(poll_first,)).start()
 
     def start_streaming(self):
         threading.Thread(target=self.grpc_stream).start()
 
     def grpc_stream(self):
-        channel = self.grpc_channel()
+        failures = 0
+        while not self.shutdown_event.is_set():
+            self.stream_state = "connecting"
+            try:
+                for resp in self.open_stream():
+                    self.stream_state = "connected"
+                    failures = 0
+                    self.load_configs(resp, "remote_api_grpc_stream")
+                self.base_client.logger().info("gRPC config stream ended")
+            except Exception as ex:
+                if not self.shutdown_event.is_set():
+                    self.base_client.logger().warn(f"gRPC config stream failed: {ex}")
+            if self.shutdown_event.is_set():
+                break
+            failures += 1
+            self.stream_reconnects += 1
+            self.stream_state = "reconnecting"
+            self.shutdown_event.wait(self.reconnect_delay(failures))
+        self.stream_state = "closed"
+
+    def open_stream(self):
+        import prefab_pb2_grpc as PrefabGrpc
         req = Prefab.ConfigServicePointer(start_at_id=self.config_loader.highwater_mark)
-        stub = PrefabGrpc.ConfigServiceStub(channel)
-        stream = stub.GetConfig(req, metadata=[("auth", self.options.api_key)])
-        for resp in stream:
-            self.load_configs(resp, "remote_api_grpc_stream")
+        stub = PrefabGrpc.ConfigServiceStub(self.grpc_channel())
+        self.stream = stub.GetConfig(req, metadata=[("auth", self.options.api_key)])
+        if self.shutdown_event.is_set():
+            # close() may have run before self.stream was assigned
+            self.stream.cancel()
+        return self.stream
+
+    def close(self):
+        self.shutdown_event.set()
+        if self.stream is not None:
+            self.stream.cancel()
+        self.flush_checkpoint_cache()
+
+    def call_later(self, delay, callback):
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+
+    def checkpointing_loop(self, poll_first=False):
+        failures = 0
+        delay = 0 if poll_first else self.checkpoint_delay(failures)
+        while not self.shutdown_event.wait(delay):
+            try:
+                failures = 0 if self.load_checkpoint() else failures + 1
+            except Exception as ex:
+                failures += 1
+                self.base_client.logger().info(f"Issue Checkpointing: {ex}")
+            delay = self.checkpoint_delay(failures)
 
-    def checkpointing_loop(self):
-        while True:
+    def start_shared_cache_thread(self):
+        threading.Thread(target=self.shared_cache_loop, daemon=True).start()
+
+    def shared_cache_loop(self):
+        while not self.shutdown_event.wait(self.shared_cache_poll_secs):
             try:
-                self.load_checkpoint()
-                time.sleep(self.checkpoint_freq_secs)
-            except:
-                self.base_client.logger().info("Issue Checkpointing")
+                if self.shared_cache_changed():
+                    self.load_shared_cache()
+            except Exception as ex:
+                self.base_client.logger().warn(f"Issue reading shared cache {self.shared_cache.path}: {ex}")
 
     def load_checkpoint_from_api_cdn(self):
-        url = "%s/api/v1/configs/0" % self.options.url_for_api_cdn
-        auth = "%s:%s" % ("authuser", self.options.api_key)
-        token = base64.b64encode(auth.encode("utf-8")).decode("ascii")
-        headers = {"Authorization": "Basic %s" % token}
-        response = urllib3.PoolManager().request("GET", url, headers=headers)
-        if response.status == 200:
-            configs = Prefab.Configs.FromString(response.data)
-            self.load_configs(configs, "remote_api_cdn")
-            return True
-        else:
-            self.base_client.logger().info(f"Checkpoint remote_cdn_api failed to load. Response {response.status}")
-            return False
+        response = self.http_pool().request("GET", self.cdn_url(), headers=self.cdn_headers())
+        return self.handle_cdn_response(response)
 
     def load_checkpoint_from_grpc_api(self):
+        import prefab_pb2_grpc as PrefabGrpc
         try:
             channel = self.grpc_channel()
             request = Prefab.ConfigServicePointer(start_at_id=self.config_loader.highwater_mark)
             stub = PrefabGrpc.ConfigServiceStub(channel)
             response = stub.GetAllConfig(request=request, metadata=[('auth', self.options.api_key)])
             self.load_configs(response, "remote_api_grpc")
+            return True
         except Exception as ex:
             self.base_client.logger().warn("Unexpected error loading GRPC checkpoint %s" % ex)
-
-    def load_configs(self, configs, source):
-        project_id = configs.config_service_pointer.project_id
-        project_env_id = configs.config_service_pointer.project_env_id
-        self.config_resolver.project_env_id = project_env_id
-        starting_highwater_mark = self.config_loader.highwater_mark
-        for config in configs.configs:
-            self.config_loader.set(config, source)
-        if self.config_loader.highwater_mark > starting_highwater_mark:
-            self.base_client.logger().info(f"Found new checkpoint with highwater id {self.config_loader.highwater_mark} from {source} in project {project_id} environment: {project_env_id} and namespace {self.base_client.options.namespace}")
-        else:
-            self.base_client.logger().debug(f"Checkpoint with highwater id {self.config_loader.highwater_mark} from {source}. No changes.")
-        self.config_resolver.update()
-        self.finish_init(source)
+            return False
 
     def finish_init(self, source):
-        if not self.init_lock._write_locked:
+        if self.is_ready:
             return
         self.base_client.logger().info(f"Unlocked config via {source}")
-        self.init_lock.release_write()
+        self.init_event.set()
+        self.is_ready = True
+
+    @property
+    def base_sleep_sec(self):
+        return self.base_client.base_sleep_sec
+
+    @property
+    def max_sleep_sec(self):
+        return self.base_client.max_sleep_sec
+
+    def logger(self):
+        return self.base_client.logger()
+
+    @functools.cache
+    def http_pool(self):
+        import urllib3
+        return urllib3.PoolManager(timeout=self.options.connection_timeout_seconds)
 
     @functools.cache
     def grpc_channel(self):
+        import grpc
+        if not self.options.http_secure:
+            return grpc.insecure_channel(self.options.prefab_grpc_url)
         creds = grpc.ssl_channel_credentials()
         return grpc.secure_channel(self.options.prefab_grpc_url, creds)
@@ -1,20 +1,45 @@
+import concurrent.futures
 import glob
 import os
+import threading
 from .yaml_parser import YamlParser
+from .yaml_cache import YamlCache
 import prefab_pb2 as Prefab
 
+PARALLEL_MIN_FILES = 4
+PARALLEL_MIN_BYTES = 1_000_000
+
+
 class ConfigLoader:
     def __init__(self, base_client):
         self.base_client = base_client
         self.options = base_client.options
         self.highwater_mark = 0
+        self.yaml_cache = None
+        if self.options.yaml_cache_dir is not None:
+            self.yaml_cache = YamlCache(self.options.yaml_cache_dir)
         self.__load_classpath_config()
         self.__load_local_overrides()
         self.api_config = {}
+        self.changed_keys = set()
+        self.changed_keys_lock = threading.Lock()
 
     def calc_config(self):
         return self.classpath_config | self.api_config | self.local_overrides
 
+    def calc_config_for(self, key):
+        for source in [self.local_overrides, self.api_config, self.classpath_config]:
+            config = source.get(key)
+            if config is not None:
+                return config
+        return None
+
+    def pop_changed_keys(self):
+        with self.changed_keys_lock:
+            changed_keys = self.changed_keys
+            self.changed_keys = set()
+        return changed_keys
+
     def set(self, config, source):
         existing_config = self.api_config.get(config.key)
         if existing_config and existing_config["config"].id >= config.id:
@@ -26,11 +51,19 @@ class ConfigLoader:
             if existing_config:
                 self.base_client.logger().debug("Replace %s with value from %s %s -> %s" % (config.key, source, existing_config["config"].id, config.id))
             self.api_config[config.key] = {"source": source, "config": config}
+        with self.changed_keys_lock:
+            self.changed_keys.add(config.key)
         self.highwater_mark = max([config.id, self.highwater_mark])
 
+    def remove(self, key):
+        if self.api_config.pop(key, None) is None:
+            return
+        with self.changed_keys_lock:
+            self.changed_keys.add(key)
+
     def get_api_deltas(self):
         configs = Prefab.Configs()
-        for config_value in self.api_config.values():
+        for config_value in list(self.api_config.values()):
             configs.configs.append(config_value["config"])
         return configs
 
@@ -45,13 +78,26 @@ class ConfigLoader:
     def __load_config_from(self, dir):
         envs = self.options.prefab_envs
         envs.insert(0, "default")
+        files = [file for env in envs for file in glob.glob(os.path.join(dir, ".prefab.%s.config.yaml" % env))]
         loaded_config = {}
-        for env in envs:
-            loaded_config.update(ConfigLoader.__load_glob(os.path.join(dir, ".prefab.%s.config.yaml" % env)))
+        for (key, config) in self.__config_entries(files):
+            loaded_config[key] = config
         return loaded_config
 
-    def __load_glob(filepath):
-        rtn = {}
-        for file in glob.glob(filepath):
-            rtn = rtn | YamlParser(file).data
-        return rtn
+    def __config_entries(self, files):
+        if not self.options.parallel_local_loading or not ConfigLoader.__parse_in_parallel(files):
+            for file in files:
+                yield from YamlParser(file, self.yaml_cache).entries()
+            return
+
+        cache_dir = self.options.yaml_cache_dir
+        max_workers = min(len(files), os.cpu_count() or 1)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            compiled_files = pool.map(YamlParser.compile, files, [cache_dir] * len(files))
+            for (file, compiled) in zip(files, compiled_files):
+                yield from YamlParser.entries_for(file, Prefab.Configs.FromString(compiled))
+
+    def __parse_in_parallel(files):
+        if len(files) < PARALLEL_MIN_FILES or (os.cpu_count() or 1) < 2:
+            return False
+        return sum(os.path.getsize(file) for file in files) >= PARALLEL_MIN_BYTES
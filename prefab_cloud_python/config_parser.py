@@ -11,17 +11,21 @@ class MissingFeatureFlagValueException(Exception):
 
 
 class ConfigParser:
-    def parse(key, value, config, source):
+    def parse(key, value, source):
+        return dict(ConfigParser.entries(key, value, source))
+
+    def entries(key, value, source):
         if isinstance(value, dict):
-            return ConfigParser.parse_dict(key, value, config, source)
+            yield from ConfigParser.dict_entries(key, value, source)
         else:
-            parsed = ConfigParser.parse_scalar(key, value, config, source)
-            config[key] = parsed
-            return config
+            yield (key, ConfigParser.parse_scalar(key, value, source))
+
+    def parse_dict(key, value, source):
+        return dict(ConfigParser.dict_entries(key, value, source))
 
-    def parse_dict(key, value, config, source):
+    def dict_entries(key, value, source):
         if value.get("feature_flag") is not None:
-            config[key] = ConfigParser.feature_flag_config(key, value, source)
+            yield (key, ConfigParser.feature_flag_config(key, value, source))
         else:
             for nest_key in value:
                 nest_value = value[nest_key]
@@ -29,10 +33,9 @@ class ConfigParser:
                     nested_key = key
                 else:
                     nested_key = "%s.%s" % (key, nest_key)
-                config = ConfigParser.parse(nested_key, nest_value, config, source)
-        return config
+                yield from ConfigParser.entries(nested_key, nest_value, source)
 
-    def parse_scalar(key, value, config, source):
+    def parse_scalar(key, value, source):
         return {
             "source": source,
             "match": "default",
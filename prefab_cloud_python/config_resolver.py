@@ -1,37 +1,218 @@
-from .read_write_lock import ReadWriteLock
-from .criteria_evaluator import CriteriaEvaluator
+import threading
+from .config_snapshot import ConfigSnapshot
+from .criteria_evaluator import CriteriaEvaluator, InvalidConfigEvaluator, NOT_CONSTANT, MIXED_TYPES
+from .config_value_unwrapper import ConfigValueUnwrapper
+from .evaluation_cache import EvaluationCache
+from .evaluation_context import EvaluationContext
+from .log_level_index import LogLevelIndex
+
+NOT_CACHED = object()
+PYTHON_TYPES = {"int": int, "bool": bool, "string": str, "double": float}
+
+
+class ConfigValueTypeException(Exception):
+    "Raised when a typed getter is used for a config of a different type"
+
+    def __init__(self, key, expected_type, actual_type):
+        super().__init__(f"Config `{key}` has type {actual_type}, expected {expected_type}")
+
 
 class ConfigResolver:
     def __init__(self, base_client, config_loader):
-        self.lock = ReadWriteLock()
+        self.update_lock = threading.Lock()
         self.base_client = base_client
         self.config_loader = config_loader
         self.project_env_id = 0
+        self.snapshot = None
         self.make_local()
 
     def get(self, key, lookup_key, properties={}):
-        self.lock.acquire_read()
-        raw_config = self.raw(key)
-        self.lock.release_read()
+        context = EvaluationContext(self.snapshot, lookup_key, properties)
+        evaluator = context.snapshot.evaluators.get(key)
+        if evaluator is None:
+            return None
+        return evaluator.evaluate(context.properties, context)
+
+    def resolve(self, key, lookup_key, properties={}):
+        snapshot = self.snapshot
+        value = snapshot.constants.get(key, NOT_CONSTANT)
+        if value is not NOT_CONSTANT:
+            return value
+        return self.resolve_in_snapshot(snapshot, key, lookup_key, properties)
+
+    def resolve_typed(self, key, value_type, lookup_key, properties={}):
+        snapshot = self.snapshot
+        value = snapshot.constants.get(key, NOT_CONSTANT)
+        if value is NOT_CONSTANT:
+            value = self.resolve_in(EvaluationContext(snapshot, lookup_key, properties), key)
+        if value is None:
+            return None
+
+        config_type = snapshot.value_types.get(key)
+        if config_type is None:
+            config_type = snapshot.value_types[key] = snapshot.evaluators[key].value_type()
+        if config_type != value_type and not (config_type == MIXED_TYPES and type(value) is PYTHON_TYPES[value_type]):
+            raise ConfigValueTypeException(key, value_type, config_type)
+        return value
+
+    def resolve_many(self, keys, lookup_key, properties={}):
+        context = EvaluationContext(self.snapshot, lookup_key, properties)
+        return {key: self.resolve_in(context, key) for key in keys}
+
+    def resolve_in_snapshot(self, snapshot, key, lookup_key=None, properties={}):
+        return self.resolve_in(EvaluationContext(snapshot, lookup_key, properties), key)
+
+    def severity_for(self, location):
+        snapshot = self.snapshot
+        if snapshot.log_level_index is None:
+            snapshot.log_level_index = LogLevelIndex.build(self, snapshot)
+        return snapshot.log_level_index.severity_for(location)
+
+    def resolve_bulk(self, key, lookup_keys, properties={}):
+        snapshot = self.snapshot
+        evaluator = snapshot.evaluators.get(key)
+        if evaluator is None:
+            return [None] * len(lookup_keys)
+        if evaluator.constant is not NOT_CONSTANT:
+            return [evaluator.constant] * len(lookup_keys)
+
+        values = []
+        weighted = {}
+        for (index, lookup_key) in enumerate(lookup_keys):
+            context = EvaluationContext(snapshot, lookup_key, properties)
+            config_value = evaluator.evaluate(context.properties, context)
+            weight_table = evaluator.weight_tables.get(id(config_value))
+            if weight_table is not None:
+                weighted.setdefault(id(weight_table), (weight_table, []))[1].append(index)
+                values.append(None)
+            else:
+                values.append(ConfigValueUnwrapper.unwrap(config_value, key, context.properties))
+
+        for (weight_table, indexes) in weighted.values():
+            variants = weight_table.resolve_many([lookup_keys[index] for index in indexes])
+            for (index, variant) in zip(indexes, variants):
+                values[index] = ConfigValueUnwrapper.unwrap(variant.value, key, {"LOOKUP": lookup_keys[index]})
+        return values
 
-        if raw_config is None:
+    def resolve_in(self, context, key):
+        snapshot = context.snapshot
+        value = snapshot.constants.get(key, NOT_CONSTANT)
+        if value is not NOT_CONSTANT:
+            return value
+        evaluator = snapshot.evaluators.get(key)
+        if evaluator is None:
             return None
-        return self.evaluate(raw_config, lookup_key, properties)
+
+        props = context.properties
+        cache = snapshot.evaluation_cache
+        cache_key = None
+        if cache is not None:
+            cache_key = self.cache_key(key, context.lookup_key, props, snapshot)
+            if cache_key is not None:
+                value = cache.get(cache_key, NOT_CACHED)
+                if value is not NOT_CACHED:
+                    return value
+
+        value = evaluator.unwrap(evaluator.evaluate(props, context), props)
+        if cache_key is not None:
+            cache.set(cache_key, value)
+        return value
+
+    def cache_key(self, key, lookup_key, props, snapshot):
+        profile = snapshot.cache_profiles.get(key)
+        if profile is None:
+            profile = snapshot.cache_profiles[key] = self.cache_profile(key, snapshot.evaluators)
+        (property_names, has_weighted_values) = profile
+        if lookup_key is None and has_weighted_values:
+            return None
+        cache_key = (key, lookup_key, tuple([props.get(name) for name in property_names]))
+        try:
+            hash(cache_key)
+        except TypeError:
+            return None
+        return cache_key
+
+    def cache_profile(self, key, evaluators):
+        property_names = set()
+        has_weighted_values = False
+        pending = [key]
+        seen = set()
+        while pending:
+            evaluator = evaluators.get(pending.pop())
+            if evaluator is None:
+                continue
+            property_names |= evaluator.property_names
+            has_weighted_values = has_weighted_values or evaluator.has_weighted_values
+            for segment_key in evaluator.segment_keys - seen:
+                seen.add(segment_key)
+                pending.append(segment_key)
+        return (tuple(sorted(property_names)), has_weighted_values)
+
+    def cache_stats(self):
+        cache = self.snapshot.evaluation_cache
+        if cache is None:
+            return None
+        return cache.stats()
 
     def raw(self, key):
-        via_key = self.local_store.get(key)
+        via_key = self.snapshot.store.get(key)
         if via_key is not None:
             return via_key["config"]
         return None
 
     def evaluate(self, config, lookup_key, properties={}):
         props = properties | {"LOOKUP": lookup_key}
-        return CriteriaEvaluator(config, project_env_id=self.project_env_id, resolver=self, base_client=self.base_client).evaluate(props)
+        return self.compile(config, self.snapshot.project_env_id).evaluate(props)
+
+    def compile(self, config, project_env_id):
+        try:
+            return CriteriaEvaluator(config, project_env_id=project_env_id, resolver=self, base_client=self.base_client)
+        except Exception as ex:
+            self.base_client.logger().warn(f"Unable to compile config `{config.key}`, it will resolve to None: {ex}")
+            return InvalidConfigEvaluator(config)
 
     def update(self):
-        self.make_local()
+        with self.update_lock:
+            project_env_id = self.project_env_id
+            if project_env_id != self.snapshot.project_env_id:
+                self.rebuild()
+                return
+
+            changed_keys = self.config_loader.pop_changed_keys()
+            if not changed_keys:
+                return
+
+            store = self.snapshot.store.copy()
+            evaluators = self.snapshot.evaluators.copy()
+            constants = self.snapshot.constants.copy()
+            for key in changed_keys:
+                value = self.config_loader.calc_config_for(key)
+                constants.pop(key, None)
+                if value is None:
+                    store.pop(key, None)
+                    evaluators.pop(key, None)
+                else:
+                    store[key] = value
+                    evaluator = evaluators[key] = self.compile(value["config"], project_env_id)
+                    if evaluator.constant is not NOT_CONSTANT:
+                        constants[key] = evaluator.constant
+            self.snapshot = ConfigSnapshot(store, project_env_id, evaluators, self.renewed_evaluation_cache(), constants)
 
     def make_local(self):
-        self.lock.acquire_write()
-        self.local_store = self.config_loader.calc_config()
-        self.lock.release_write()
+        with self.update_lock:
+            self.rebuild()
+
+    def rebuild(self):
+        project_env_id = self.project_env_id
+        self.config_loader.pop_changed_keys()
+        store = self.config_loader.calc_config()
+        evaluators = {key: self.compile(value["config"], project_env_id) for (key, value) in store.items()}
+        self.snapshot = ConfigSnapshot(store, project_env_id, evaluators, self.renewed_evaluation_cache())
+
+    def renewed_evaluation_cache(self):
+        if self.snapshot is not None and self.snapshot.evaluation_cache is not None:
+            return self.snapshot.evaluation_cache.renewed()
+        cache_size = self.base_client.options.evaluation_cache_size
+        if cache_size > 0:
+            return EvaluationCache(cache_size)
+        return None
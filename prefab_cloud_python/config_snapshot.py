@@ -0,0 +1,19 @@
+from .criteria_evaluator import NOT_CONSTANT
+
+
+class ConfigSnapshot:
+    "An immutable view of the resolved config store. Updates publish a new snapshot rather than mutating this one."
+
+    def __init__(self, store, project_env_id, evaluators, evaluation_cache=None, constants=None):
+        self.store = store
+        self.project_env_id = project_env_id
+        self.evaluators = evaluators
+        if constants is None:
+            constants = {
+                key: evaluator.constant for (key, evaluator) in evaluators.items() if evaluator.constant is not NOT_CONSTANT
+            }
+        self.constants = constants
+        self.evaluation_cache = evaluation_cache
+        self.cache_profiles = {}
+        self.value_types = {}
+        self.log_level_index = None
@@ -1,67 +1,162 @@
 from .config_value_unwrapper import ConfigValueUnwrapper
+from .weighted_value_resolver import WeightTable
+from .evaluation_context import SegmentCycleException
 import prefab_pb2 as Prefab
 import google
 
 OPS = Prefab.Criterion.CriterionOperator
+SEGMENT_OPS = [OPS.IN_SEG, OPS.NOT_IN_SEG]
+CONSTANT_TYPES = ["int", "string", "double", "bool", "log_level", "string_list"]
+NOT_CONSTANT = object()
+MIXED_TYPES = "mixed"
+
 
 class CriteriaEvaluator:
+    "Compiles a config once so `evaluate` only runs pre-resolved criterion matchers"
+
     def __init__(self, config, project_env_id, resolver, base_client):
         self.config = config
         self.project_env_id = project_env_id
         self.resolver = resolver
         self.base_client = base_client
+        conditional_values = [*self.matching_environment_row_values(), *self.default_row_values()]
+        self.conditional_values = [
+            (self.compile_criteria(conditional_value.criteria), conditional_value.value)
+            for conditional_value in conditional_values
+        ]
+
+        self.weight_tables = {
+            id(value): WeightTable(value.weighted_values.weighted_values, config.key)
+            for (_, value) in self.conditional_values if value.WhichOneof("type") == "weighted_values"
+        }
 
-    def evaluate(self, props):
-        for conditional_value in self.matching_environment_row_values():
-            if self.all_criteria_match(conditional_value, props):
-                return conditional_value.value
-        for conditional_value in self.default_row_values():
-            if self.all_criteria_match(conditional_value, props):
-                return conditional_value.value
+        criteria = [criterion for conditional_value in conditional_values for criterion in conditional_value.criteria]
+        self.property_names = frozenset(
+            criterion.property_name for criterion in criteria
+            if criterion.property_name and criterion.operator not in SEGMENT_OPS
+        )
+        self.segment_keys = frozenset(
+            criterion.value_to_match.string for criterion in criteria if criterion.operator in SEGMENT_OPS
+        )
+        self.has_weighted_values = any(
+            config_value.WhichOneof("type") == "weighted_values"
+            for config_value in [
+                *[conditional_value.value for conditional_value in conditional_values],
+                *[criterion.value_to_match for criterion in criteria],
+            ]
+        )
+        self.constant = self.constant_value()
+
+    def evaluate(self, props, context=None):
+        for (criteria, value) in self.conditional_values:
+            for criterion in criteria:
+                if not criterion(props, context):
+                    break
+            else:
+                return value
         return None
 
-    def all_criteria_match(self, conditional_value, props):
-        # all(conditional_value.criteria,
-        for criterion in conditional_value.criteria:
-            if not self.evaluate_criterion(criterion, props):
-                return False
-        return True
-
-    def evaluate_criterion(self, criterion, properties):
-        value_from_properties = properties.get(criterion.property_name)
-
-        if criterion.operator in [OPS.LOOKUP_KEY_IN, OPS.PROP_IS_ONE_OF]:
-            return self.matches(criterion, value_from_properties, properties)
-        if criterion.operator in [OPS.LOOKUP_KEY_NOT_IN, OPS.PROP_IS_NOT_ONE_OF]:
-            return not self.matches(criterion, value_from_properties, properties)
-        if criterion.operator == OPS.IN_SEG:
-            return self.in_segment(criterion, properties)
-        if criterion.operator == OPS.NOT_IN_SEG:
-            return not self.in_segment(criterion, properties)
-        if criterion.operator == OPS.PROP_ENDS_WITH_ONE_OF:
-            if value_from_properties is None:
-                return False
-            return any([value_from_properties.endswith(ending) for ending in criterion.value_to_match.string_list.values])
-        if criterion.operator == OPS.PROP_DOES_NOT_END_WITH_ONE_OF:
-            if value_from_properties is None:
-                return True
-            return not any([value_from_properties.endswith(ending) for ending in criterion.value_to_match.string_list.values])
-        if criterion.operator == OPS.HIERARCHICAL_MATCH:
-            value_from_properties.startswith(criterion.value_to_match.string)
-        if criterion.operator == OPS.ALWAYS_TRUE:
-            return True
+    def constant_value(self):
+        if not self.conditional_values or self.conditional_values[0][0]:
+            return NOT_CONSTANT
+        value = self.conditional_values[0][1]
+        if value.WhichOneof("type") == "weighted_values" and len(value.weighted_values.weighted_values) == 1:
+            value = value.weighted_values.weighted_values[0].value
+        if value.WhichOneof("type") not in CONSTANT_TYPES:
+            return NOT_CONSTANT
+        return ConfigValueUnwrapper.unwrap(value, self.config.key)
 
-        self.base_client.logger().info(f"Unknown criterion operator {criterion.operator}")
-        return False
+    def value_type(self):
+        types = set()
+        for (_, value) in self.conditional_values:
+            if value.WhichOneof("type") == "weighted_values":
+                types.update(weighted.value.WhichOneof("type") for weighted in value.weighted_values.weighted_values)
+            else:
+                types.add(value.WhichOneof("type"))
+        return types.pop() if len(types) == 1 else MIXED_TYPES
+
+    def unwrap(self, config_value, props):
+        weight_table = self.weight_tables.get(id(config_value))
+        if weight_table is None:
+            return ConfigValueUnwrapper.unwrap(config_value, self.config.key, props)
+        variant = weight_table.resolve(props.get("LOOKUP"))
+        return ConfigValueUnwrapper.unwrap(variant.value, self.config.key, props)
 
-    def matches(self, criterion, value, properties):
-        criterion_value_or_values = ConfigValueUnwrapper.unwrap(criterion.value_to_match, self.config.key, properties)
+    def compile_criteria(self, criteria):
+        return tuple(self.compile_criterion(criterion) for criterion in criteria)
+
+    def compile_criterion(self, criterion):
+        operator = criterion.operator
+        property_name = criterion.property_name
+
+        if operator in [OPS.LOOKUP_KEY_IN, OPS.PROP_IS_ONE_OF]:
+            return self.compile_matches(criterion)
+        if operator in [OPS.LOOKUP_KEY_NOT_IN, OPS.PROP_IS_NOT_ONE_OF]:
+            matches = self.compile_matches(criterion)
+            return lambda props, context: not matches(props, context)
+        if operator == OPS.IN_SEG:
+            segment_key = criterion.value_to_match.string
+            return lambda props, context: self.in_segment(segment_key, props, context)
+        if operator == OPS.NOT_IN_SEG:
+            segment_key = criterion.value_to_match.string
+            return lambda props, context: not self.in_segment(segment_key, props, context)
+        if operator == OPS.PROP_ENDS_WITH_ONE_OF:
+            endings = SuffixMatcher(criterion.value_to_match.string_list.values)
+            return lambda props, _context: endings.matches(props.get(property_name))
+        if operator == OPS.PROP_DOES_NOT_END_WITH_ONE_OF:
+            endings = SuffixMatcher(criterion.value_to_match.string_list.values)
+            return lambda props, _context: not endings.matches(props.get(property_name))
+        if operator == OPS.HIERARCHICAL_MATCH:
+            prefix = criterion.value_to_match.string
+            return lambda props, _context: CriteriaEvaluator.starts_with(props.get(property_name), prefix)
+        if operator == OPS.ALWAYS_TRUE:
+            return lambda _props, _context: True
+
+        self.base_client.logger().info(f"Unknown criterion operator {operator}")
+        return lambda _props, _context: False
+
+    def compile_matches(self, criterion):
+        property_name = criterion.property_name
+        value_to_match = criterion.value_to_match
+
+        if value_to_match.WhichOneof("type") == "weighted_values":
+            return lambda props, _context: self.matches(value_to_match, props.get(property_name), props)
+
+        criterion_value_or_values = ConfigValueUnwrapper.unwrap(value_to_match, self.config.key)
+        if isinstance(criterion_value_or_values, google._upb._message.RepeatedScalarContainer):
+            values = frozenset(criterion_value_or_values)
+            return lambda props, _context: CriteriaEvaluator.is_one_of(props.get(property_name), values)
+        return lambda props, _context: props.get(property_name) == criterion_value_or_values
+
+    def matches(self, value_to_match, value, properties):
+        criterion_value_or_values = ConfigValueUnwrapper.unwrap(value_to_match, self.config.key, properties)
         if isinstance(criterion_value_or_values, google._upb._message.RepeatedScalarContainer):
             return value in criterion_value_or_values
         return value == criterion_value_or_values
 
-    def in_segment(self, criterion, properties):
-        return self.resolver.get(criterion.value_to_match.string, properties.get("LOOKUP"), properties).bool
+    def in_segment(self, segment_key, properties, context):
+        if context is None:
+            segment_value = self.resolver.get(segment_key, properties.get("LOOKUP"), properties)
+        else:
+            try:
+                segment_value = context.segment_value(segment_key)
+            except SegmentCycleException as ex:
+                self.base_client.logger().warn(f"{ex}. Treating `{self.config.key}` as not in the segment.")
+                return False
+        return segment_value is not None and segment_value.bool
+
+    @staticmethod
+    def is_one_of(value, values):
+        try:
+            return value in values
+        except TypeError:
+            return False
+
+    @staticmethod
+    def starts_with(value, prefix):
+        if value is None:
+            return False
+        return value.startswith(prefix)
 
     def matching_environment_row_values(self):
         env_rows = [row for row in self.config.rows if row.project_env_id == self.project_env_id]
@@ -76,3 +171,53 @@ class CriteriaEvaluator:
             return []
         else:
             return env_rows[0].values
+
+
+class InvalidConfigEvaluator:
+    "Stands in for a config that failed to compile, so only that key resolves to None"
+
+    def __init__(self, config):
+        self.config = config
+        self.conditional_values = []
+        self.weight_tables = {}
+        self.property_names = frozenset()
+        self.segment_keys = frozenset()
+        self.has_weighted_values = False
+        self.constant = NOT_CONSTANT
+
+    def evaluate(self, props, context=None):
+        return None
+
+    def unwrap(self, config_value, props):
+        return None
+
+    def value_type(self):
+        return MIXED_TYPES
+
+
+class SuffixMatcher:
+    "Checks a string against any number of suffixes with one set lookup per distinct suffix length"
+
+    def __init__(self, suffixes):
+        self.matches_any_string = "" in suffixes
+        suffixes_by_length = {}
+        for suffix in suffixes:
+            if suffix:
+                suffixes_by_length.setdefault(len(suffix), set()).add(suffix)
+        self.suffixes_by_length = [
+            (length, frozenset(suffixes_by_length[length])) for length in sorted(suffixes_by_length)
+        ]
+
+    def matches(self, value):
+        if not isinstance(value, str):
+            return False
+        if self.matches_any_string:
+            return True
+
+        value_length = len(value)
+        for (length, suffixes) in self.suffixes_by_length:
+            if length > value_length:
+                return False
+            if value[-length:] in suffixes:
+                return True
+        return False
@@ -0,0 +1,40 @@
+import threading
+from collections import OrderedDict
+
+
+class EvaluationCache:
+    "A bounded LRU of evaluated config values. Only ever valid for the store it was created alongside."
+
+    def __init__(self, max_size, hits=0, misses=0):
+        self.max_size = max_size
+        self.hits = hits
+        self.misses = misses
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, cache_key, default=None):
+        with self.lock:
+            value = self.entries.get(cache_key, default)
+            if value is default:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(cache_key)
+            return value
+
+    def set(self, cache_key, value):
+        with self.lock:
+            self.entries[cache_key] = value
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def renewed(self):
+        return EvaluationCache(self.max_size, hits=self.hits, misses=self.misses)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+        }
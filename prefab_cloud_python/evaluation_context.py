@@ -0,0 +1,37 @@
+IN_PROGRESS = object()
+
+
+class SegmentCycleException(Exception):
+    "Raised when a segment depends on itself"
+
+    def __init__(self, segment_key):
+        super().__init__("Segment `%s` references itself through its criteria" % segment_key)
+
+
+class EvaluationContext:
+    "One set of properties evaluated against one snapshot. Segment results are memoized for the life of the context."
+
+    def __init__(self, snapshot, lookup_key, properties={}):
+        self.snapshot = snapshot
+        self.lookup_key = lookup_key
+        self.properties = properties | {"LOOKUP": lookup_key}
+        self.segment_values = {}
+
+    def segment_value(self, segment_key):
+        if segment_key in self.segment_values:
+            value = self.segment_values[segment_key]
+            if value is IN_PROGRESS:
+                raise SegmentCycleException(segment_key)
+            return value
+
+        evaluator = self.snapshot.evaluators.get(segment_key)
+        if evaluator is None:
+            value = None
+        else:
+            self.segment_values[segment_key] = IN_PROGRESS
+            try:
+                value = evaluator.evaluate(self.properties, self)
+            finally:
+                del self.segment_values[segment_key]
+        self.segment_values[segment_key] = value
+        return value
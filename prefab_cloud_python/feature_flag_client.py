@@ -1,3 +1,6 @@
+import itertools
+
+
 class FeatureFlagClient:
     def __init__(self, base_client):
         self.base_client = base_client
@@ -19,6 +22,19 @@ class FeatureFlagClient:
     def _get(self, feature_name, lookup_key=None, attributes={}):
         return self.base_client.config_client().get(feature_name, None, attributes, lookup_key)
 
+    def get_bulk(self, feature_name, lookup_keys, attributes={}, default=False):
+        return list(self.iter_bulk(feature_name, lookup_keys, attributes, default))
+
+    def iter_bulk(self, feature_name, lookup_keys, attributes={}, default=False, chunk_size=10_000):
+        lookup_keys = iter(lookup_keys)
+        config_client = self.base_client.config_client()
+        while True:
+            chunk = list(itertools.islice(lookup_keys, chunk_size))
+            if not chunk:
+                return
+            for value in config_client.resolve_bulk(feature_name, chunk, attributes):
+                yield default if value is None else value
+
     def is_on(self, variant):
         try:
             if variant is None:
@@ -29,8 +45,3 @@ class FeatureFlagClient:
         except:
             self.base_client.logger().info(f"is_on methods only work for boolean feature flag variants. This feature flag's variant is '{variant}'. Returning False")
             return False
-
-
-
-
-
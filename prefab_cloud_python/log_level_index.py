@@ -0,0 +1,54 @@
+import prefab_pb2 as Prefab
+
+from ._processors import LOG_LEVEL_BASE_KEY, prefab_to_python_log_levels
+
+MAX_CACHED_LOCATIONS = 10_000
+
+
+class LogLevelIndex:
+    "A prefix trie of one snapshot's `log-level.*` configs, with the effective severity memoized per location"
+
+    def __init__(self, levels):
+        self.root = LogLevelNode()
+        for (key, level) in levels.items():
+            node = self.root
+            if key != LOG_LEVEL_BASE_KEY:
+                for segment in key[len(LOG_LEVEL_BASE_KEY) + 1:].split("."):
+                    node = node.children.setdefault(segment, LogLevelNode())
+            node.level = level
+        self.severities = {}
+
+    @staticmethod
+    def build(resolver, snapshot):
+        prefix = LOG_LEVEL_BASE_KEY + "."
+        keys = [key for key in snapshot.store if key == LOG_LEVEL_BASE_KEY or key.startswith(prefix)]
+        return LogLevelIndex({key: resolver.resolve_in_snapshot(snapshot, key) for key in keys})
+
+    def severity_for(self, location):
+        severity = self.severities.get(location)
+        if severity is None:
+            severity = self.find_severity(location)
+            if len(self.severities) >= MAX_CACHED_LOCATIONS:
+                self.severities.clear()
+            self.severities[location] = severity
+        return severity
+
+    def find_severity(self, location):
+        closest_log_level = self.root.level
+        if closest_log_level is None:
+            closest_log_level = Prefab.LogLevel.Value("WARN")
+
+        node = self.root
+        for segment in location.split("."):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.level is not None:
+                closest_log_level = node.level
+        return prefab_to_python_log_levels[closest_log_level]
+
+
+class LogLevelNode:
+    def __init__(self):
+        self.level = None
+        self.children = {}
@@ -1,28 +1,33 @@
-import structlog
+import functools
 import os
-from ._processors import clean_event_dict, set_location, log_or_drop
-
-
-structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-        structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
-        structlog.processors.CallsiteParameterAdder(
-            [
-                structlog.processors.CallsiteParameter.PATHNAME,
-                structlog.processors.CallsiteParameter.FUNC_NAME,
-            ],
-            additional_ignores=["prefab_cloud_python.logger_client"]
-        ),
-        set_location,
-        log_or_drop,
-        clean_event_dict,
-        structlog.dev.ConsoleRenderer(),
-    ]
-)
+import sys
+from ._processors import clean_event_dict, set_location, log_or_drop, find_severity, get_path, python_to_prefab_log_levels
+
+
+@functools.cache
+def configure_structlog():
+    import structlog
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.dev.set_exc_info,
+            structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+            structlog.processors.CallsiteParameterAdder(
+                [
+                    structlog.processors.CallsiteParameter.PATHNAME,
+                    structlog.processors.CallsiteParameter.FUNC_NAME,
+                ],
+                additional_ignores=["prefab_cloud_python.logger_client"]
+            ),
+            set_location,
+            log_or_drop,
+            clean_event_dict,
+            structlog.dev.ConsoleRenderer(),
+        ]
+    )
+    return structlog
 
 
 class BootstrappingConfigClient:
@@ -32,33 +37,53 @@ class BootstrappingConfigClient:
             return bootstrap_log_level.upper()
         return default
 
+    def severity_for(self, location):
+        return find_severity(location, self)
+
 
 class LoggerClient:
     def __init__(self, log_prefix=None):
         self.log_prefix = log_prefix
         self.config_client = BootstrappingConfigClient()
+        self.bound_logger = None
+        self.locations = {}
 
     def debug(self, msg):
-        self.configured_logger().debug(msg)
+        self.log(msg, "debug")
 
     def info(self, msg):
-        self.configured_logger().info(msg)
+        self.log(msg, "info")
 
     def warn(self, msg):
-        self.configured_logger().warn(msg)
+        self.log(msg, "warn")
 
     def error(self, msg):
-        self.configured_logger().error(msg)
+        self.log(msg, "error")
 
     def critical(self, msg):
-        self.configured_logger().critical(msg)
+        self.log(msg, "critical")
+
+    def log(self, msg, method):
+        location = self.location_of(sys._getframe(2).f_code)
+        if self.config_client.severity_for(location) > python_to_prefab_log_levels[method]:
+            return
+        getattr(self.configured_logger(), method)(msg, location=location)
+
+    def location_of(self, code):
+        location = self.locations.get(code)
+        if location is None:
+            location = self.locations[code] = get_path(code.co_filename, code.co_name, self.log_prefix)
+        return location
 
     def set_config_client(self, config_client):
         self.config_client = config_client
+        self.bound_logger = None
 
     def add_config_client(self, _, __, event_dict):
         event_dict["config_client"] = self.config_client
         return event_dict
 
     def configured_logger(self):
-        return structlog.get_logger().bind(config_client=self.config_client, log_prefix=self.log_prefix)
+        if self.bound_logger is None:
+            self.bound_logger = configure_structlog().get_logger().bind(config_client=self.config_client, log_prefix=self.log_prefix)
+        return self.bound_logger
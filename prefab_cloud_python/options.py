@@ -30,6 +30,16 @@ class InvalidGrpcUrlException(Exception):
         super().__init__("Invalid gRPC URL found: %s" % url)
 
 
+class MissingSharedCacheException(Exception):
+    "Raised when the SHARED_CACHE datasource is used without a shared cache path"
+
+    def __init__(self):
+        super().__init__("The SHARED_CACHE datasource requires a `shared_cache` path")
+
+
+OFFLINE_DATASOURCES = ['LOCAL_ONLY', 'SHARED_CACHE']
+
+
 class Options:
     def __init__(
         self,
@@ -47,6 +57,11 @@ class Options:
         http_secure=None,
         on_no_default='RAISE',
         on_connection_failure='RETURN',
+        evaluation_cache_size=0,
+        checkpoint_cache_path=None,
+        shared_cache=None,
+        yaml_cache_dir=None,
+        parallel_local_loading=False,
     ):
         self.prefab_datasources = Options.__validate_datasource(
             prefab_datasources)
@@ -65,16 +80,28 @@ class Options:
             "PREFAB_CLOUD_HTTP") != "true"
         self.prefab_envs = Options.__construct_prefab_envs(prefab_envs)
         self.stats = None
-        self.shared_cache = None
+        self.__set_shared_cache(shared_cache or os.environ.get("PREFAB_SHARED_CACHE"))
         self.__set_url_for_api_cdn()
         self.__set_on_no_default(on_no_default)
         self.__set_on_connection_failure(on_connection_failure)
+        self.evaluation_cache_size = evaluation_cache_size or 0
+        self.checkpoint_cache_path = checkpoint_cache_path or os.environ.get("PREFAB_CHECKPOINT_CACHE_PATH")
+        self.yaml_cache_dir = yaml_cache_dir or os.environ.get("PREFAB_YAML_CACHE_DIR")
+        self.parallel_local_loading = parallel_local_loading
 
     def is_local_only(self):
         return self.prefab_datasources == 'LOCAL_ONLY'
 
+    def is_shared_cache_only(self):
+        return self.prefab_datasources == 'SHARED_CACHE'
+
+    def __set_shared_cache(self, shared_cache):
+        if self.is_shared_cache_only() and shared_cache is None:
+            raise MissingSharedCacheException()
+        self.shared_cache = shared_cache
+
     def __set_url_for_api_cdn(self):
-        if self.prefab_datasources == "LOCAL_ONLY":
+        if self.prefab_datasources in OFFLINE_DATASOURCES:
             self.url_for_api_cdn = None
         else:
             cdn_url_from_env = os.environ.get("PREFAB_CDN_URL")
@@ -86,18 +113,18 @@ class Options:
                     ".", "-") + ".global.ssl.fastly.net"
 
     def __validate_datasource(datasource):
-        if os.getenv("PREFAB_DATASOURCES") == 'LOCAL_ONLY':
-            default = 'LOCAL_ONLY'
+        if os.getenv("PREFAB_DATASOURCES") in OFFLINE_DATASOURCES:
+            default = os.getenv("PREFAB_DATASOURCES")
         else:
             default = 'ALL'
 
-        if datasource in ['LOCAL_ONLY', 'ALL']:
+        if datasource in [*OFFLINE_DATASOURCES, 'ALL']:
             return datasource
         else:
             return default
 
     def __set_api_key(self, api_key):
-        if self.prefab_datasources == 'LOCAL_ONLY':
+        if self.prefab_datasources in OFFLINE_DATASOURCES:
             self.api_key = None
             return
 
@@ -109,7 +136,7 @@ class Options:
         self.api_key = api_key
 
     def __set_api_url(self, api_url):
-        if self.prefab_datasources == 'LOCAL_ONLY':
+        if self.prefab_datasources in OFFLINE_DATASOURCES:
             self.prefab_api_url = None
             return
 
@@ -121,7 +148,7 @@ class Options:
             raise InvalidApiUrlException(api_url)
 
     def __set_grpc_url(self, grpc_url):
-        if self.prefab_datasources == 'LOCAL_ONLY':
+        if self.prefab_datasources in OFFLINE_DATASOURCES:
             self.prefab_grpc_url = None
             return
 
@@ -1,3 +1,5 @@
+import bisect
+import itertools
 import random
 import mmh3
 
@@ -8,31 +10,71 @@ class WeightedValueResolver:
         self.weights = weights
         self.key = key
         self.lookup_key = lookup_key
+        self.table = WeightTable(weights, key)
 
     def resolve(self):
-        if self.lookup_key is not None:
-            percent = self.user_percent()
+        return self.table.resolve(self.lookup_key)
+
+    def user_percent(self):
+        return self.table.user_percent(self.lookup_key)
+
+    def variant_index(self, percent):
+        return self.table.variant_index(percent)
+
+    @staticmethod
+    def resolve_many(weights, key, lookup_keys):
+        return WeightTable(weights, key).resolve_many(lookup_keys)
+
+
+class WeightTable:
+    "Cumulative weights for one set of weighted values, computed once so each resolution is a bisect"
+
+    def __init__(self, weights, key):
+        self.weights = list(weights)
+        self.key = key
+        self.bucket_ends = list(itertools.accumulate([w.weight for w in self.weights]))
+        self.distribution_space = self.bucket_ends[-1] if self.bucket_ends else 0
+        self.last_index = len(self.weights) - 1
+
+    def resolve(self, lookup_key=None):
+        if lookup_key is not None:
+            percent = self.user_percent(lookup_key)
         else:
             percent = random.random()
 
-        index = self.variant_index(percent)
+        return self.weights[self.variant_index(percent)]
 
-        return self.weights[index]
-
-    def user_percent(self):
-        to_hash = "%s%s" % (self.key, self.lookup_key)
+    def user_percent(self, lookup_key):
+        to_hash = "%s%s" % (self.key, lookup_key)
         int_value = mmh3.hash(to_hash, signed=False)
         return int_value / max_32_float
 
     def variant_index(self, percent):
-        distribution_space = sum([w.weight for w in self.weights])
-        bucket = distribution_space * percent
+        index = bisect.bisect_right(self.bucket_ends, self.distribution_space * percent)
+        return min(index, self.last_index)
+
+    def resolve_many(self, lookup_keys):
+        key = self.key
+        percents = [
+            random.random() if lookup_key is None else mmh3.hash("%s%s" % (key, lookup_key), signed=False) / max_32_float
+            for lookup_key in lookup_keys
+        ]
+        return [self.weights[index] for index in self.variant_indexes(percents)]
+
+    def variant_indexes(self, percents):
+        numpy = numpy_or_none()
+
+        if numpy is None:
+            return [self.variant_index(percent) for percent in percents]
 
-        bucket_sum = 0
-        for (index, variant_weight) in enumerate(self.weights):
-            if bucket < bucket_sum + variant_weight.weight:
-                return index
-            bucket_sum += variant_weight.weight
+        buckets = self.distribution_space * numpy.asarray(percents, dtype=numpy.float64)
+        indexes = numpy.searchsorted(numpy.asarray(self.bucket_ends), buckets, side="right")
+        return numpy.minimum(indexes, self.last_index).tolist()
 
-        return len(self.weights) - 1
 
+def numpy_or_none():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
@@ -0,0 +1,49 @@
+import hashlib
+import os
+import struct
+import tempfile
+
+import prefab_pb2 as Prefab
+from google.protobuf.message import DecodeError
+
+MAGIC = b"PFYC"
+HEADER = struct.Struct("<4sqQ32sQ")
+
+
+class YamlCache:
+    "Compiled Prefab.Configs for local YAML files, reused until the file's stat and content hash change"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def path_for(self, filename):
+        name = hashlib.sha256(os.path.abspath(filename).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "%s.pb" % name)
+
+    def load(self, filename, stat, digest=None):
+        try:
+            with open(self.path_for(filename), "rb") as file:
+                data = file.read()
+            (magic, mtime_ns, size, cached_digest, length) = HEADER.unpack_from(data)
+            if magic != MAGIC or HEADER.size + length != len(data):
+                return None
+            if digest is None and (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+                return None
+            if digest is not None and digest != cached_digest:
+                return None
+            return Prefab.Configs.FromString(data[HEADER.size:])
+        except (OSError, struct.error, DecodeError):
+            return None
+
+    def save(self, filename, stat, digest, configs):
+        payload = configs.SerializeToString()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        (fd, temp_path) = tempfile.mkstemp(dir=self.cache_dir, prefix=".prefab-yaml-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(HEADER.pack(MAGIC, stat.st_mtime_ns, stat.st_size, digest, len(payload)))
+                file.write(payload)
+            os.replace(temp_path, self.path_for(filename))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -1,20 +1,61 @@
 from .config_parser import ConfigParser
+from .yaml_cache import YamlCache
+import functools
+import hashlib
+import os
+import prefab_pb2 as Prefab
 import yaml
 
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class YamlParser:
-    def __init__(self, filename):
+    def __init__(self, filename, cache=None):
         self.filename = filename
-        self.parse()
+        self.cache = cache
 
-    def parse(self):
-        f = open(self.filename, "r")
-        yaml_data = yaml.safe_load(f.read())
-        config = {}
+    @functools.cached_property
+    def data(self):
+        return dict(self.entries())
+
+    def entries(self):
+        if self.cache is None:
+            with open(self.filename, "rb") as f:
+                yield from self.parse_bytes(f.read())
+            return
+
+        stat = os.stat(self.filename)
+        configs = self.cache.load(self.filename, stat)
+        if configs is not None:
+            yield from YamlParser.entries_for(self.filename, configs)
+            return
+
+        with open(self.filename, "rb") as f:
+            contents = f.read()
+        digest = hashlib.sha256(contents).digest()
+        configs = self.cache.load(self.filename, stat, digest)
+        if configs is None:
+            configs = Prefab.Configs(configs=[config["config"] for (_, config) in self.parse_bytes(contents)])
+        try:
+            self.cache.save(self.filename, stat, digest, configs)
+        except OSError:
+            pass
+        yield from YamlParser.entries_for(self.filename, configs)
+
+    def parse_bytes(self, contents):
+        yaml_data = yaml.load(contents, Loader=SafeLoader)
         for key in yaml_data:
-            config = ConfigParser.parse(key, yaml_data[key], config, self.filename)
-        f.close()
-        self.data = config
+            yield from ConfigParser.entries(key, yaml_data[key], self.filename)
 
+    @staticmethod
+    def entries_for(filename, configs):
+        for config in configs.configs:
+            match = config.key if config.config_type == Prefab.ConfigType.Value("FEATURE_FLAG") else "default"
+            yield (config.key, {"source": filename, "match": match, "config": config})
 
+    @staticmethod
+    def compile(filename, cache_dir=None):
+        "Parses one file into serialized Prefab.Configs; the entry point for process pool workers"
+        cache = None if cache_dir is None else YamlCache(cache_dir)
+        configs = Prefab.Configs(configs=[config["config"] for config in YamlParser(filename, cache).data.values()])
+        return configs.SerializeToString()
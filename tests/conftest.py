@@ -0,0 +1,101 @@
+import prefab_pb2 as Prefab
+import prefab_pb2_grpc as PrefabGrpc
+import concurrent.futures
+import grpc
+import gzip
+import http.server
+import pytest
+import threading
+import time
+
+
+def string_configs(id, key, value):
+    return Prefab.Configs(
+        config_service_pointer=Prefab.ConfigServicePointer(project_id=1, project_env_id=2),
+        configs=[
+            Prefab.Config(id=id, key=key, rows=[
+                Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string=value))])
+            ])
+        ]
+    )
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+class StubConfigService(PrefabGrpc.ConfigServiceServicer):
+    "Sends `streams[n]` to the nth connection, drops every connection but the last, then holds the last one open"
+
+    def __init__(self):
+        self.start_at_ids = []
+        self.streams = [[string_configs(1, "streamed", "first")], [string_configs(2, "streamed", "second")]]
+        self.closed = threading.Event()
+
+    def GetConfig(self, request, context):
+        self.start_at_ids.append(request.start_at_id)
+        index = min(len(self.start_at_ids), len(self.streams)) - 1
+        yield from self.streams[index]
+        if index < len(self.streams) - 1:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "going away")
+        while context.is_active() and not self.closed.is_set():
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def config_service():
+    service = StubConfigService()
+    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=4))
+    PrefabGrpc.add_ConfigServiceServicer_to_server(service, server)
+    service.address = "127.0.0.1:%s" % server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    yield service
+    service.closed.set()
+    server.stop(None)
+
+
+class StubCdn(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if self.headers.get("If-None-Match") == server.etag:
+            server.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = server.configs.SerializeToString()
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+        server.statuses.append(200)
+        server.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cdn():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubCdn)
+    server.configs = Prefab.Configs(configs=[
+        Prefab.Config(id=id, key=f"key-{id}", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="value " * 20))])
+        ]) for id in range(1, 50)
+    ])
+    server.etag = '"checkpoint-49"'
+    server.statuses = []
+    server.bytes_sent = 0
+    server.url = "http://127.0.0.1:%s" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
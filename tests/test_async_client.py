@@ -0,0 +1,114 @@
+from prefab_cloud_python import Options, AsyncClient
+from prefab_cloud_python.checkpoint_cache import CheckpointCache
+from prefab_cloud_python.config_client import InitializationTimeoutException, MissingDefaultException
+from tests.conftest import string_configs
+import asyncio
+import pytest
+
+
+class TestAsyncClient:
+    def test_ready_and_get_local_only(self):
+        async def scenario():
+            client = AsyncClient(self.options(prefab_datasources="LOCAL_ONLY"))
+            await client.ready()
+            assert client.get("sample_int") == 123
+            assert client.get("bad key", "default value") == "default value"
+            assert client.enabled("in_lookup_key", lookup_key="abc123")
+            assert not client.enabled("in_lookup_key", lookup_key="def456")
+            await client.close()
+
+        asyncio.run(scenario())
+
+    def test_missing_values_use_the_default_handling(self):
+        client = AsyncClient(self.options(prefab_datasources="LOCAL_ONLY"))
+        with pytest.raises(MissingDefaultException):
+            client.get("bad key")
+
+        client = AsyncClient(self.options(prefab_datasources="LOCAL_ONLY", on_no_default="RETURN_NONE"))
+        assert client.get("bad key") is None
+
+    def test_loads_from_cdn_and_stream(self, cdn, config_service):
+        cdn.configs = string_configs(1, "from_cdn", "cdn")
+        config_service.streams = [[string_configs(2, "from_stream", "stream")]]
+
+        async def scenario():
+            client = AsyncClient(self.network_options(cdn, config_service))
+
+            await client.ready()
+            assert client.get("from_cdn") == "cdn"
+
+            await self.wait_for(lambda: client.get("from_stream", default=None) == "stream")
+            assert client.stream_state == "connected"
+            assert config_service.start_at_ids[0] >= 0
+
+            await client.close()
+            assert client.stream_state == "closed"
+
+        asyncio.run(scenario())
+
+    def test_boots_from_the_checkpoint_cache_then_polls(self, tmp_path, cdn, config_service):
+        path = str(tmp_path / "checkpoint")
+        CheckpointCache(path, "123-development-yourapikey-SDK").save(string_configs(1, "from_cache", "cache"), 1)
+        cdn.configs = string_configs(3, "from_cdn", "cdn")
+        config_service.streams = [[]]
+
+        async def scenario():
+            client = AsyncClient(self.network_options(cdn, config_service, checkpoint_cache_path=path))
+            client.start()
+            assert client.is_ready.is_set()
+            assert client.get("from_cache") == "cache"
+
+            await self.wait_for(lambda: client.get("from_cdn", default=None) == "cdn")
+            await client.close()
+
+        asyncio.run(scenario())
+        assert CheckpointCache(path).highwater_mark() == 3
+
+    def test_shared_cache_subscriber(self, tmp_path):
+        path = str(tmp_path / "snapshot")
+        CheckpointCache(path).save(string_configs(1, "shared", "first"), 1)
+
+        async def scenario():
+            client = AsyncClient(self.options(prefab_datasources="SHARED_CACHE", shared_cache=path))
+            client.shared_cache_poll_secs = 0.01
+            await client.ready()
+            assert client.get("shared") == "first"
+
+            CheckpointCache(path).save(string_configs(2, "shared", "second"), 2)
+            await self.wait_for(lambda: client.get("shared") == "second")
+            await client.close()
+
+        asyncio.run(scenario())
+
+    def test_ready_times_out(self):
+        async def scenario():
+            options = self.options(api_key="123-development-yourapikey-SDK", on_connection_failure="RAISE")
+            options.connection_timeout_seconds = 0.05
+            client = AsyncClient(options)
+            client.start = lambda: None
+            with pytest.raises(InitializationTimeoutException):
+                await client.ready()
+
+        asyncio.run(scenario())
+
+    @staticmethod
+    def options(**kwargs):
+        return Options(prefab_config_classpath_dir="tests", prefab_envs=["unit_tests"], **kwargs)
+
+    @staticmethod
+    def network_options(cdn, config_service, **kwargs):
+        options = TestAsyncClient.options(api_key="123-development-yourapikey-SDK", **kwargs)
+        options.url_for_api_cdn = cdn.url
+        options.prefab_grpc_url = config_service.address
+        options.http_secure = False
+        return options
+
+    @staticmethod
+    async def wait_for(condition, timeout=5):
+        await asyncio.wait_for(TestAsyncClient.poll(condition), timeout)
+
+    @staticmethod
+    async def poll(condition):
+        while not condition():
+            await asyncio.sleep(0.01)
+
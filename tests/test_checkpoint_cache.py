@@ -0,0 +1,155 @@
+from prefab_cloud_python import Options, Client
+from prefab_cloud_python.checkpoint_cache import CheckpointCache
+import prefab_pb2 as Prefab
+
+
+class TestCheckpointCache:
+    def test_save_and_load(self, tmp_path):
+        cache = CheckpointCache(str(tmp_path / "checkpoint"))
+        configs = self.configs()
+
+        cache.save(configs, 5)
+
+        assert cache.load() == configs
+
+    def test_load_missing_file(self, tmp_path):
+        assert CheckpointCache(str(tmp_path / "missing")).load() is None
+
+    def test_load_corrupt_file(self, tmp_path):
+        path = tmp_path / "checkpoint"
+        path.write_bytes(b"not a checkpoint")
+        assert CheckpointCache(str(path)).load() is None
+
+        path.write_bytes(b"")
+        assert CheckpointCache(str(path)).load() is None
+
+    def test_config_client_round_trip(self, tmp_path):
+        path = str(tmp_path / "checkpoint")
+        config_client = self.build_config_client(path)
+
+        config_client.load_configs(self.configs(), "remote_api_cdn")
+        config_client.flush_checkpoint_cache()
+
+        restored = self.build_config_client(path)
+        assert restored.get("sample_int") == 123
+        assert restored.load_checkpoint_from_cache()
+        assert restored.get("sample_int") == 456
+        assert restored.config_loader.highwater_mark == 5
+        assert restored.config_resolver.project_env_id == 2
+
+    def test_config_client_without_cache(self):
+        config_client = self.build_config_client(None)
+
+        assert not config_client.load_checkpoint_from_cache()
+
+    def test_load_rejects_another_api_key(self, tmp_path):
+        path = str(tmp_path / "checkpoint")
+        CheckpointCache(path, "123-development-first-SDK").save(self.configs(), 5)
+
+        assert CheckpointCache(path, "123-development-first-SDK").load() == self.configs()
+        assert CheckpointCache(path, "456-production-second-SDK").load() is None
+
+    def test_load_rejects_another_project_environment(self, tmp_path):
+        cache = CheckpointCache(str(tmp_path / "checkpoint"))
+        cache.save(self.configs(), 5)
+
+        assert cache.load(2) == self.configs()
+        assert cache.load(3) is None
+
+    def test_cache_writes_are_debounced(self, tmp_path):
+        path = str(tmp_path / "checkpoint")
+        config_client = self.build_config_client(path)
+        config_client.cache_write_delay_secs = 60
+        saves = []
+        config_client.checkpoint_cache.save = lambda configs, highwater_mark: saves.append(highwater_mark)
+
+        for id in range(5, 10):
+            config_client.load_configs(Prefab.Configs(configs=[
+                Prefab.Config(id=id, key="sample_int", rows=[
+                    Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(int=id))])
+                ])
+            ]), "remote_api_grpc_stream")
+        assert saves == []
+
+        config_client.close()
+        assert saves == [9]
+
+    def test_highwater_mark_reads_the_header(self, tmp_path):
+        cache = CheckpointCache(str(tmp_path / "checkpoint"))
+        assert cache.highwater_mark() is None
+
+        cache.save(self.configs(), 5)
+
+        assert cache.highwater_mark() == 5
+
+    def test_shared_cache_subscriber(self, tmp_path):
+        path = str(tmp_path / "snapshot")
+        publisher = self.build_config_client(None, shared_cache=path)
+        publisher.load_configs(self.configs(), "remote_api_cdn")
+        publisher.flush_checkpoint_cache()
+
+        subscriber = self.build_config_client(None, prefab_datasources="SHARED_CACHE", shared_cache=path)
+        assert subscriber.get("sample_int") == 456
+        assert subscriber.shared_cache_highwater_mark == 5
+
+        publisher.load_configs(Prefab.Configs(
+            config_service_pointer=Prefab.ConfigServicePointer(project_id=1, project_env_id=2),
+            configs=[
+                Prefab.Config(id=6, key="sample_int"),
+                Prefab.Config(id=7, key="sample_string", rows=[
+                    Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="shared"))])
+                ]),
+            ]
+        ), "remote_api_grpc_stream")
+        publisher.flush_checkpoint_cache()
+
+        assert subscriber.shared_cache.highwater_mark() == 7
+        assert subscriber.load_shared_cache()
+        assert subscriber.get("sample_int") == 123
+        assert subscriber.get("sample_string") == "shared"
+
+    def test_checkpoint_cache_and_shared_cache_are_both_written(self, tmp_path):
+        checkpoint_path = str(tmp_path / "checkpoint")
+        shared_path = str(tmp_path / "snapshot")
+        publisher = self.build_config_client(checkpoint_path, shared_cache=shared_path)
+
+        publisher.load_configs(self.configs(), "remote_api_cdn")
+        publisher.flush_checkpoint_cache()
+
+        assert CheckpointCache(checkpoint_path).highwater_mark() == 5
+        assert CheckpointCache(shared_path).highwater_mark() == 5
+        subscriber = self.build_config_client(None, prefab_datasources="SHARED_CACHE", shared_cache=shared_path)
+        assert subscriber.get("sample_int") == 456
+
+    def test_booting_from_the_checkpoint_cache_publishes_the_shared_snapshot(self, tmp_path):
+        checkpoint_path = str(tmp_path / "checkpoint")
+        shared_path = str(tmp_path / "snapshot")
+        CheckpointCache(checkpoint_path).save(self.configs(), 5)
+        publisher = self.build_config_client(checkpoint_path, shared_cache=shared_path)
+
+        assert publisher.load_checkpoint_from_cache()
+        publisher.flush_checkpoint_cache()
+
+        assert CheckpointCache(shared_path).highwater_mark() == 5
+
+    @staticmethod
+    def configs():
+        return Prefab.Configs(
+            config_service_pointer=Prefab.ConfigServicePointer(project_id=1, project_env_id=2),
+            configs=[
+                Prefab.Config(id=5, key="sample_int", rows=[
+                    Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(int=456))])
+                ])
+            ]
+        )
+
+    @staticmethod
+    def build_config_client(checkpoint_cache_path, prefab_datasources="LOCAL_ONLY", shared_cache=None):
+        options = Options(
+            prefab_config_classpath_dir="tests",
+            prefab_envs=["unit_tests"],
+            prefab_datasources=prefab_datasources,
+            checkpoint_cache_path=checkpoint_cache_path,
+            shared_cache=shared_cache,
+        )
+        return Client(options).config_client()
@@ -1,5 +1,6 @@
 from prefab_cloud_python import Options, Client
 from prefab_cloud_python.config_client import MissingDefaultException
+from prefab_cloud_python.config_resolver import ConfigValueTypeException
 import pytest
 
 @pytest.fixture
@@ -66,3 +67,48 @@ class TestClient:
     def test_getting_feature_flag_value(self, client):
         assert not client.enabled("flag_with_a_value")
         assert client.get("flag_with_a_value") == "all-features"
+
+    def test_get_many(self, client):
+        values = client.get_many(["sample", "sample_int", "in_lookup_key", "just_my_domain"], lookup_key="abc123", properties={"domain": "gmail.com"})
+
+        assert values == {"sample": "test sample value", "sample_int": 123, "in_lookup_key": True, "just_my_domain": None}
+
+    def test_get_many_accepts_an_iterator(self, client):
+        values = client.get_many(key for key in ["sample", "sample_int"])
+
+        assert values == {"sample": "test sample value", "sample_int": 123}
+
+    def test_get_many_with_default(self, client):
+        values = client.get_many(["sample", "missing_value", "just_my_domain"], default="DEFAULT", lookup_key="abc123")
+
+        assert values == {"sample": "test sample value", "missing_value": "DEFAULT", "just_my_domain": "DEFAULT"}
+
+    def test_get_many_with_missing_default(self, client):
+        with pytest.raises(MissingDefaultException) as exception:
+            client.get_many(["sample", "missing_value"])
+
+        assert "No value found for key 'missing_value'" in str(exception)
+
+    def test_typed_getters(self, client):
+        assert client.get_int("sample_int") == 123
+        assert client.get_float("sample_double") == 12.12
+        assert client.get_bool("sample_bool") is True
+        assert client.get_bool("false_value") is False
+        assert client.get_string("sample") == "test sample value"
+        assert client.get_bool("in_lookup_key", lookup_key="abc123") is True
+        assert client.get_string("just_my_domain", properties={"domain": "example.com"}) == "new-version"
+
+    def test_typed_getters_with_defaults(self, client):
+        assert client.get_int("missing_value", default=7) == 7
+        assert client.get_string("just_my_domain", default="old-version", properties={"domain": "gmail.com"}) == "old-version"
+        assert client.get_string("just_my_domain", properties={"domain": "gmail.com"}) is None
+
+        with pytest.raises(MissingDefaultException):
+            client.get_int("missing_value")
+
+    def test_typed_getters_reject_the_wrong_type(self, client):
+        with pytest.raises(ConfigValueTypeException) as exception:
+            client.get_int("sample")
+
+        assert "Config `sample` has type string, expected int" in str(exception.value)
+        assert client.config_client().config_resolver.snapshot.value_types == {"sample": "string"}
@@ -1,7 +1,13 @@
 from prefab_cloud_python import Options, Client
-from prefab_cloud_python.config_client import MissingDefaultException
+from prefab_cloud_python.checkpoint_cache import CheckpointCache
+from prefab_cloud_python.config_client import ConfigClient, MissingDefaultException, InitializationTimeoutException
+from tests.conftest import wait_for
 import prefab_pb2 as Prefab
+import grpc
+import gzip
 import pytest
+import threading
+import time
 
 
 class TestConfigClient:
@@ -31,6 +37,48 @@ class TestConfigClient:
         config_client = self.build_config_client("RETURN_NONE")
         assert config_client.get("bad key") is None
 
+    def test_get_waits_for_initialization(self):
+        config_client = self.uninitialized_config_client("RAISE")
+        threading.Timer(0.05, lambda: config_client.finish_init("test")).start()
+
+        assert config_client.get("sample_int") == 123
+        assert config_client.is_ready
+
+    def test_get_raises_when_initialization_times_out(self):
+        config_client = self.uninitialized_config_client("RAISE")
+
+        with pytest.raises(InitializationTimeoutException):
+            config_client.get("sample_int")
+        assert not config_client.is_ready
+
+    def test_get_returns_what_we_have_when_initialization_times_out(self):
+        config_client = self.uninitialized_config_client("RETURN")
+
+        assert config_client.get("sample_int") == 123
+        assert config_client.is_ready
+
+    def test_initialization_does_not_start_threads(self):
+        thread_count = threading.active_count()
+        self.build_config_client()
+        assert threading.active_count() == thread_count
+
+    def test_cdn_checkpoint_is_conditional_and_compressed(self, cdn):
+        config_client = self.build_config_client()
+        config_client.options.url_for_api_cdn = cdn.url
+        config_client.options.api_key = "123-development-yourapikey-SDK"
+        loads = []
+        config_client.load_configs = lambda configs, source: loads.append(configs)
+
+        assert config_client.load_checkpoint_from_api_cdn()
+        assert config_client.load_checkpoint_from_api_cdn()
+        assert config_client.load_checkpoint_from_api_cdn()
+
+        assert loads == [cdn.configs]
+        assert cdn.statuses == [200, 304, 304]
+        assert cdn.bytes_sent == len(gzip.compress(cdn.configs.SerializeToString()))
+        assert cdn.bytes_sent < len(cdn.configs.SerializeToString())
+        assert config_client.http_pool() is config_client.http_pool()
+
     @staticmethod
     def build_config_client(on_no_default="RAISE"):
         options = Options(
@@ -41,3 +89,132 @@ class TestConfigClient:
         )
         client = Client(options)
         return client.config_client()
+
+    @staticmethod
+    def uninitialized_config_client(on_connection_failure):
+        config_client = TestConfigClient.build_config_client()
+        config_client.options.connection_timeout_seconds = 0.2
+        config_client.options.on_connection_failure = on_connection_failure
+        config_client.is_ready = False
+        config_client.init_event = threading.Event()
+        return config_client
+
+
+class TestConfigClientStream:
+    def test_stream_reconnects_and_resumes_from_highwater_mark(self, config_service):
+        config_client = TestConfigClient.build_config_client()
+        config_client.base_client.base_sleep_sec = 0.01
+        config_client.options.api_key = "123-development-yourapikey-SDK"
+        config_client.grpc_channel = lambda: grpc.insecure_channel(config_service.address)
+        thread = threading.Thread(target=config_client.grpc_stream)
+        thread.start()
+
+        wait_for(lambda: config_client.get("streamed", default=None) == "second")
+        assert config_client.stream_state == "connected"
+        assert config_client.stream_reconnects == 1
+        assert config_service.start_at_ids == [0, 1]
+
+        config_client.close()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert config_client.stream_state == "closed"
+
+    def test_stream_opened_while_closing_is_cancelled(self, config_service):
+        config_client = TestConfigClient.build_config_client()
+        config_client.options.api_key = "123-development-yourapikey-SDK"
+        config_client.grpc_channel = lambda: grpc.insecure_channel(config_service.address)
+        config_client.close()
+
+        stream = config_client.open_stream()
+
+        assert stream.cancelled()
+        assert stream.code() == grpc.StatusCode.CANCELLED
+
+    def test_reconnect_delay_is_capped_and_jittered(self):
+        config_client = TestConfigClient.build_config_client()
+
+        delays = [config_client.reconnect_delay(failures) for failures in range(1, 10)]
+
+        assert 0.25 <= delays[0] <= 0.5
+        assert 2 <= delays[3] <= 4
+        assert all(delay <= 10 for delay in delays)
+
+
+class TestConfigClientCheckpointing:
+    def test_checkpoint_delay_adapts_to_stream_and_failures(self):
+        config_client = TestConfigClient.build_config_client()
+
+        assert config_client.checkpoint_delay(0) == 60
+        config_client.stream_state = "connected"
+        assert config_client.checkpoint_delay(0) == 600
+        assert [config_client.checkpoint_delay(failures) for failures in range(1, 6)] == [60, 120, 240, 480, 600]
+
+    def test_checkpointing_loop_backs_off_on_errors_and_stops_on_close(self):
+        config_client = TestConfigClient.build_config_client()
+        config_client.checkpoint_freq_secs = 0.01
+        config_client.checkpoint_max_backoff_secs = 0.05
+        attempts = []
+
+        def failing_checkpoint():
+            attempts.append(time.time())
+            raise Exception("CDN unavailable")
+        config_client.load_checkpoint = failing_checkpoint
+
+        thread = threading.Thread(target=config_client.checkpointing_loop)
+        thread.start()
+        time.sleep(0.3)
+        config_client.close()
+        thread.join(1)
+
+        assert not thread.is_alive()
+        assert 2 <= len(attempts) <= 12
+
+    def test_checkpointing_loop_polls_first_when_asked(self):
+        config_client = TestConfigClient.build_config_client()
+        polled = threading.Event()
+        config_client.load_checkpoint = lambda: polled.set() or True
+
+        thread = threading.Thread(target=config_client.checkpointing_loop, args=(True,))
+        thread.start()
+        try:
+            assert polled.wait(1)
+        finally:
+            config_client.close()
+            thread.join(1)
+        assert not thread.is_alive()
+
+    def test_booting_from_the_checkpoint_cache_polls_immediately(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "checkpoint")
+        CheckpointCache(path, "123-development-yourapikey-SDK").save(Prefab.Configs(configs=[
+            Prefab.Config(id=1, key="cached", rows=[
+                Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="from cache"))])
+            ])
+        ]), 1)
+        network_loads = []
+        checkpointing = []
+        monkeypatch.setattr(ConfigClient, "load_checkpoint", lambda self: network_loads.append(True) or True)
+        monkeypatch.setattr(ConfigClient, "start_checkpointing_thread", lambda self, poll_first=False: checkpointing.append(poll_first))
+        monkeypatch.setattr(ConfigClient, "start_streaming", lambda self: None)
+
+        options = Options(
+            api_key="123-development-yourapikey-SDK",
+            prefab_config_classpath_dir="tests",
+            prefab_envs=["unit_tests"],
+            checkpoint_cache_path=path,
+        )
+        config_client = Client(options).config_client()
+
+        assert config_client.get("cached") == "from cache"
+        assert network_loads == []
+        assert checkpointing == [True]
+
+    def test_a_successful_initial_load_waits_before_polling(self, monkeypatch):
+        checkpointing = []
+        monkeypatch.setattr(ConfigClient, "load_checkpoint", lambda self: self.finish_init("test") or True)
+        monkeypatch.setattr(ConfigClient, "start_checkpointing_thread", lambda self, poll_first=False: checkpointing.append(poll_first))
+        monkeypatch.setattr(ConfigClient, "start_streaming", lambda self: None)
+
+        Client(Options(api_key="123-development-yourapikey-SDK", prefab_config_classpath_dir="tests", prefab_envs=["unit_tests"])).config_client()
+
+        assert checkpointing == [False]
+
@@ -1,6 +1,9 @@
 from prefab_cloud_python import Options, Client
 from prefab_cloud_python.config_parser import ConfigParser
 from prefab_cloud_python.config_value_unwrapper import ConfigValueUnwrapper
+from prefab_cloud_python import config_loader
+import concurrent.futures
+import os
 import prefab_pb2 as Prefab
 
 
@@ -119,6 +122,34 @@ class TestConfigLoader:
 
         assert loader.get_api_deltas() == Prefab.Configs()
 
+    def test_parallel_loading_matches_sequential_precedence(self, tmp_path, monkeypatch):
+        for (index, env) in enumerate(["default", "a", "b", "c"]):
+            (tmp_path / (".prefab.%s.config.yaml" % env)).write_text(
+                "shared: %s\nonly_%s: %d\nnested:\n  value: %s\n" % (env, env, index, env)
+            )
+        sequential = self.loader_for(tmp_path).classpath_config
+
+        monkeypatch.setattr(config_loader, "PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        parallel = self.loader_for(tmp_path, parallel_local_loading=True).classpath_config
+
+        assert parallel == sequential
+        assert list(parallel) == list(sequential)
+        self.assert_correct_config(self.loader_for(tmp_path), "shared", "string", "c")
+        self.assert_correct_config(self.loader_for(tmp_path), "only_a", "int", 1)
+
+    def test_parallel_loading_is_opt_in(self, tmp_path, monkeypatch):
+        for env in ["default", "a", "b", "c"]:
+            (tmp_path / (".prefab.%s.config.yaml" % env)).write_text("shared: %s\n" % env)
+        monkeypatch.setattr(config_loader, "PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+        def no_process_pool(*args, **kwargs):
+            raise AssertionError("started a process pool")
+        monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_process_pool)
+
+        self.assert_correct_config(self.loader_for(tmp_path), "shared", "string", "c")
+
     @staticmethod
     def assert_correct_config(loader, key, type, value):
         value_from_config = loader.calc_config()[key]["config"].rows[0].values[0].value
@@ -133,3 +164,14 @@ class TestConfigLoader:
             prefab_datasources="LOCAL_ONLY"
         )
         return Client(options)
+
+    @staticmethod
+    def loader_for(classpath_dir, parallel_local_loading=False):
+        options = Options(
+            prefab_config_classpath_dir=str(classpath_dir),
+            prefab_config_override_dir=str(classpath_dir / "missing"),
+            prefab_envs=["a", "b", "c"],
+            prefab_datasources="LOCAL_ONLY",
+            parallel_local_loading=parallel_local_loading,
+        )
+        return Client(options).config_client().config_loader
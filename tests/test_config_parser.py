@@ -9,7 +9,7 @@ default_match = "default"
 class TestConfigParser:
     def test_parse_int(self):
         key = "sample_int"
-        parsed = ConfigParser.parse(key, 123, {}, file_name)[key]
+        parsed = ConfigParser.parse(key, 123, file_name)[key]
 
         config = parsed["config"]
 
@@ -24,7 +24,7 @@ class TestConfigParser:
     def test_parse_map(self):
         key = "nested"
         value = {"_": "top level", "string": "nested value", "int": 123}
-        parsed = ConfigParser.parse(key, value, {}, file_name)
+        parsed = ConfigParser.parse(key, value, file_name)
 
         top_level = parsed[key]
         assert top_level["source"] == file_name
@@ -51,7 +51,7 @@ class TestConfigParser:
         key = "sample_flag"
         flag = {"feature_flag": True, "value": "sample value"}
 
-        parsed = ConfigParser.parse(key, flag, {}, file_name)[key]
+        parsed = ConfigParser.parse(key, flag, file_name)[key]
         config = parsed["config"]
 
         assert parsed["source"] == file_name
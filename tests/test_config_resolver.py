@@ -0,0 +1,332 @@
+from prefab_cloud_python import Options, Client
+import prefab_pb2 as Prefab
+
+project_env_id = 1
+
+
+class TestConfigResolver:
+    def test_resolve(self):
+        resolver = self.build_resolver()
+
+        assert resolver.resolve("sample", None) == "test sample value"
+        assert resolver.resolve("in_lookup_key", "abc123") is True
+        assert resolver.resolve("in_lookup_key", "jimmy") is None
+        assert resolver.resolve("missing_value", None) is None
+
+    def test_cache_is_disabled_by_default(self):
+        resolver = self.build_resolver(evaluation_cache_size=0)
+
+        assert resolver.resolve("sample", None) == "test sample value"
+        assert resolver.cache_stats() is None
+
+    def test_cache_hits_and_misses(self):
+        resolver = self.build_resolver()
+
+        resolver.resolve("in_lookup_key", "abc123")
+        resolver.resolve("in_lookup_key", "abc123")
+        resolver.resolve("just_my_domain", "abc123", {"domain": "prefab.cloud"})
+        resolver.resolve("just_my_domain", "abc123", {"domain": "prefab.cloud"})
+
+        assert resolver.cache_stats() == {"hits": 2, "misses": 2, "size": 2, "max_size": 10}
+
+    def test_cache_key_ignores_unreferenced_properties(self):
+        resolver = self.build_resolver()
+
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": "example.com", "request_id": 1}) == "new-version"
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": "example.com", "request_id": 2}) == "new-version"
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": "gmail.com", "request_id": 3}) is None
+
+        assert resolver.cache_stats()["hits"] == 1
+        assert resolver.cache_stats()["size"] == 2
+
+    def test_cache_key_includes_properties_referenced_by_segments(self):
+        resolver = self.build_resolver()
+        resolver.config_loader.set(self.segment_config(), "test")
+        resolver.config_loader.set(self.flag_in_segment_config(), "test")
+        resolver.project_env_id = project_env_id
+        resolver.update()
+
+        assert resolver.resolve("segmented", "user:1", {"email": "a@prefab.cloud"}) == "in"
+        assert resolver.resolve("segmented", "user:1", {"email": "a@example.com"}) == "out"
+        assert resolver.cache_stats()["misses"] == 2
+
+    def test_unhashable_properties_skip_the_cache(self):
+        resolver = self.build_resolver()
+
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": ["prefab.cloud"]}) is None
+        assert resolver.cache_stats() == {"hits": 0, "misses": 0, "size": 0, "max_size": 10}
+
+    def test_update_invalidates_the_cache(self):
+        resolver = self.build_resolver()
+
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": "prefab.cloud"}) == "new-version"
+        resolver.config_loader.set(Prefab.Config(id=1, key="just_my_domain", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(
+                criteria=[Prefab.Criterion(
+                    operator="PROP_IS_ONE_OF",
+                    property_name="domain",
+                    value_to_match=Prefab.ConfigValue(string_list=Prefab.StringList(values=["prefab.cloud"])),
+                )],
+                value=Prefab.ConfigValue(string="newer-version"),
+            )])
+        ]), "test")
+        resolver.update()
+
+        assert resolver.resolve("just_my_domain", "abc123", {"domain": "prefab.cloud"}) == "newer-version"
+        assert resolver.cache_stats() == {"hits": 0, "misses": 2, "size": 1, "max_size": 10}
+
+    def test_constants_skip_evaluation_and_the_cache(self):
+        resolver = self.build_resolver()
+
+        assert resolver.snapshot.constants["sample_int"] == 123
+        assert resolver.snapshot.constants["flag_with_a_value"] == "all-features"
+        assert "just_my_domain" not in resolver.snapshot.constants
+        evaluations = [self.count_evaluations(resolver, key) for key in ["sample_int", "sample", "flag_with_a_value"]]
+
+        assert resolver.resolve("sample_int", None) == 123
+        assert resolver.resolve_many(["sample", "sample_bool"], None) == {"sample": "test sample value", "sample_bool": True}
+        assert resolver.resolve_bulk("flag_with_a_value", ["a", "b"]) == ["all-features", "all-features"]
+        assert evaluations == [[0], [0], [0]]
+        assert resolver.cache_stats()["misses"] == 0
+
+    def test_update_maintains_constants(self):
+        resolver = self.build_resolver()
+
+        resolver.config_loader.set(Prefab.Config(id=1, key="sample_int", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(int=456))])
+        ]), "test")
+        resolver.config_loader.set(self.flag_in_segment_config(key="sample"), "test")
+        resolver.update()
+
+        assert resolver.snapshot.constants["sample_int"] == 456
+        assert "sample" not in resolver.snapshot.constants
+
+    def test_update_publishes_a_new_snapshot(self):
+        resolver = self.build_resolver()
+        previous = resolver.snapshot
+
+        resolver.config_loader.set(Prefab.Config(id=1, key="sample_int", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(int=456))])
+        ]), "test")
+        resolver.project_env_id = project_env_id
+        resolver.update()
+
+        assert resolver.snapshot is not previous
+        assert resolver.snapshot.project_env_id == project_env_id
+        assert resolver.raw("sample_int").rows[0].values[0].value.int == 456
+        assert previous.project_env_id == 0
+        assert previous.store["sample_int"]["config"].rows[0].values[0].value.int == 123
+
+    def test_update_only_recompiles_changed_keys(self):
+        resolver = self.build_resolver()
+        previous = resolver.snapshot
+
+        resolver.config_loader.set(Prefab.Config(id=1, key="sample_int", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(int=456))])
+        ]), "test")
+        resolver.config_loader.set(Prefab.Config(id=2, key="new_key", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="new"))])
+        ]), "test")
+        resolver.update()
+
+        assert resolver.snapshot.store == resolver.config_loader.calc_config()
+        assert resolver.snapshot.evaluators["sample"] is previous.evaluators["sample"]
+        assert resolver.snapshot.evaluators["sample_int"] is not previous.evaluators["sample_int"]
+        assert resolver.resolve("sample_int", None) == 456
+        assert resolver.resolve("new_key", None) == "new"
+
+    def test_update_applies_tombstones_and_respects_local_overrides(self):
+        resolver = self.build_resolver()
+        loader = resolver.config_loader
+        loader.local_overrides = {"sample": loader.classpath_config["sample_int"]}
+
+        loader.set(Prefab.Config(id=1, key="sample", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="from api"))])
+        ]), "test")
+        loader.set(Prefab.Config(id=2, key="only_api", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="from api"))])
+        ]), "test")
+        resolver.update()
+
+        assert resolver.resolve("sample", None) == 123
+        assert resolver.resolve("only_api", None) == "from api"
+
+        loader.set(Prefab.Config(id=3, key="only_api", rows=[]), "test")
+        resolver.update()
+
+        assert resolver.resolve("only_api", None) is None
+        assert resolver.snapshot.store == loader.calc_config()
+
+    def test_update_without_changes_keeps_the_snapshot(self):
+        resolver = self.build_resolver()
+        previous = resolver.snapshot
+
+        resolver.update()
+
+        assert resolver.snapshot is previous
+
+    def test_resolve_many_evaluates_shared_segments_once(self):
+        resolver = self.build_resolver(evaluation_cache_size=0)
+        resolver.config_loader.set(self.segment_config(), "test")
+        resolver.config_loader.set(self.flag_in_segment_config(), "test")
+        resolver.config_loader.set(self.flag_in_segment_config(id=3, key="also_segmented"), "test")
+        resolver.project_env_id = project_env_id
+        resolver.update()
+        segment_evaluations = self.count_evaluations(resolver, "beta-users")
+
+        values = resolver.resolve_many(["segmented", "also_segmented", "sample"], "user:1", {"email": "a@prefab.cloud"})
+
+        assert values == {"segmented": "in", "also_segmented": "in", "sample": "test sample value"}
+        assert segment_evaluations == [1]
+
+    def test_segments_are_evaluated_once_per_resolve(self):
+        resolver = self.build_resolver(evaluation_cache_size=0)
+        resolver.config_loader.set(self.segment_config(), "test")
+        resolver.config_loader.set(Prefab.Config(
+            id=2,
+            key="segmented_twice",
+            rows=[
+                Prefab.ConfigRow(
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(operator="IN_SEG", value_to_match=Prefab.ConfigValue(string="beta-users")),
+                                Prefab.Criterion(operator="PROP_IS_ONE_OF", property_name="admin", value_to_match=Prefab.ConfigValue(bool=True))
+                            ],
+                            value=Prefab.ConfigValue(string="beta admin")
+                        ),
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(operator="IN_SEG", value_to_match=Prefab.ConfigValue(string="beta-users"))
+                            ],
+                            value=Prefab.ConfigValue(string="beta")
+                        ),
+                    ]
+                )
+            ]
+        ), "test")
+        resolver.update()
+        segment_evaluations = self.count_evaluations(resolver, "beta-users")
+
+        assert resolver.resolve("segmented_twice", "user:1", {"email": "a@prefab.cloud"}) == "beta"
+        assert segment_evaluations == [1]
+
+    def test_segment_cycles_do_not_match(self):
+        resolver = self.build_resolver(evaluation_cache_size=0)
+        resolver.config_loader.set(self.segment_in_segment_config(1, "segment-a", "segment-b"), "test")
+        resolver.config_loader.set(self.segment_in_segment_config(2, "segment-b", "segment-a"), "test")
+        resolver.config_loader.set(self.flag_in_segment_config(id=3, segment_key="segment-a"), "test")
+        resolver.project_env_id = project_env_id
+        resolver.update()
+
+        assert resolver.resolve("segmented", "user:1") == "out"
+        assert resolver.get("segmented", "user:1").string == "out"
+
+    def test_a_config_that_fails_to_compile_does_not_block_others(self):
+        config_client = self.build_resolver().base_client.config_client()
+        bad = Prefab.Config(id=1, key="bad", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(
+                criteria=[Prefab.Criterion(operator="PROP_IS_ONE_OF", property_name="domain")],
+                value=Prefab.ConfigValue(string="never"),
+            )])
+        ])
+        good = Prefab.Config(id=2, key="good", rows=[
+            Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(string="visible"))])
+        ])
+
+        config_client.load_configs(Prefab.Configs(configs=[bad, good]), "test")
+
+        assert config_client.get("good") == "visible"
+        assert config_client.get("bad", default="fallback") == "fallback"
+        assert config_client.config_resolver.resolve_many(["bad", "good"], None) == {"bad": None, "good": "visible"}
+
+    @staticmethod
+    def segment_config():
+        return Prefab.Config(
+            id=1,
+            key="beta-users",
+            config_type="SEGMENT",
+            rows=[
+                Prefab.ConfigRow(
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(
+                                    operator="PROP_ENDS_WITH_ONE_OF",
+                                    property_name="email",
+                                    value_to_match=Prefab.ConfigValue(string_list=Prefab.StringList(values=["prefab.cloud"]))
+                                )
+                            ],
+                            value=Prefab.ConfigValue(bool=True)
+                        ),
+                        Prefab.ConditionalValue(value=Prefab.ConfigValue(bool=False))
+                    ]
+                )
+            ]
+        )
+
+    @staticmethod
+    def count_evaluations(resolver, key):
+        evaluator = resolver.snapshot.evaluators[key]
+        evaluate = evaluator.evaluate
+        count = [0]
+
+        def counting_evaluate(*args):
+            count[0] += 1
+            return evaluate(*args)
+
+        evaluator.evaluate = counting_evaluate
+        return count
+
+    @staticmethod
+    def segment_in_segment_config(id, key, segment_key):
+        return Prefab.Config(
+            id=id,
+            key=key,
+            config_type="SEGMENT",
+            rows=[
+                Prefab.ConfigRow(
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(operator="IN_SEG", value_to_match=Prefab.ConfigValue(string=segment_key))
+                            ],
+                            value=Prefab.ConfigValue(bool=True)
+                        ),
+                        Prefab.ConditionalValue(value=Prefab.ConfigValue(bool=False))
+                    ]
+                )
+            ]
+        )
+
+    @staticmethod
+    def flag_in_segment_config(id=2, key="segmented", segment_key="beta-users"):
+        return Prefab.Config(
+            id=id,
+            key=key,
+            config_type="CONFIG",
+            rows=[
+                Prefab.ConfigRow(
+                    project_env_id=project_env_id,
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(operator="IN_SEG", value_to_match=Prefab.ConfigValue(string=segment_key))
+                            ],
+                            value=Prefab.ConfigValue(string="in")
+                        ),
+                        Prefab.ConditionalValue(value=Prefab.ConfigValue(string="out"))
+                    ]
+                )
+            ]
+        )
+
+    @staticmethod
+    def build_resolver(evaluation_cache_size=10):
+        options = Options(
+            prefab_config_classpath_dir="tests",
+            prefab_envs=["unit_tests"],
+            prefab_datasources="LOCAL_ONLY",
+            evaluation_cache_size=evaluation_cache_size,
+        )
+        return Client(options).config_client().config_resolver
@@ -1,4 +1,4 @@
-from prefab_cloud_python.criteria_evaluator import CriteriaEvaluator
+from prefab_cloud_python.criteria_evaluator import CriteriaEvaluator, SuffixMatcher
 import prefab_pb2 as Prefab
 
 project_env_id = 1
@@ -226,6 +226,78 @@ class TestCriteriaEvaluator:
         assert evaluator.evaluate({"email": "example@prefab.cloud"}).string == desired_value
         assert evaluator.evaluate({"email": "example@hotmail.com"}).string == default_value
 
+    def test_large_lookup_key_allowlist(self):
+        allowlist = ["user:%s" % i for i in range(50_000)]
+        config = Prefab.Config(
+            key=key,
+            rows=[
+                default_row,
+                Prefab.ConfigRow(
+                    project_env_id=project_env_id,
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(
+                                    operator="LOOKUP_KEY_IN",
+                                    value_to_match=Prefab.ConfigValue(
+                                        string_list=Prefab.StringList(values=allowlist)
+                                    ),
+                                    property_name="LOOKUP"
+                                )
+                            ],
+                            value=Prefab.ConfigValue(string=desired_value)
+                        )
+                    ]
+                )
+            ]
+        )
+
+        evaluator = CriteriaEvaluator(config, project_env_id, resolver=None, base_client=None)
+
+        assert evaluator.evaluate({"LOOKUP": "user:49999"}).string == desired_value
+        assert evaluator.evaluate({"LOOKUP": "user:50000"}).string == default_value
+        assert evaluator.evaluate({"LOOKUP": ["user:1"]}).string == default_value
+
+    def test_suffix_matcher_agrees_with_endswith(self):
+        suffixes = ["gmail.com", "hotmail.com", "mail.com", ".edu", "x"]
+        matcher = SuffixMatcher(suffixes)
+
+        for value in ["a@gmail.com", "a@mail.com", "a@email.com", "prof@school.edu", "edu", "box", "", "a@prefab.cloud"]:
+            assert matcher.matches(value) == value.endswith(tuple(suffixes)), value
+
+        assert not matcher.matches(None)
+        assert SuffixMatcher(["", "gmail.com"]).matches("anything")
+        assert not SuffixMatcher([]).matches("anything")
+
+    def test_hierarchical_match(self):
+        config = Prefab.Config(
+            key=key,
+            rows=[
+                default_row,
+                Prefab.ConfigRow(
+                    project_env_id=project_env_id,
+                    values=[
+                        Prefab.ConditionalValue(
+                            criteria=[
+                                Prefab.Criterion(
+                                    operator="HIERARCHICAL_MATCH",
+                                    value_to_match=Prefab.ConfigValue(string="team.engineering"),
+                                    property_name="team_path"
+                                )
+                            ],
+                            value=Prefab.ConfigValue(string=desired_value)
+                        )
+                    ]
+                )
+            ]
+        )
+
+        evaluator = CriteriaEvaluator(config, project_env_id, resolver=None, base_client=None)
+
+        assert evaluator.evaluate({}).string == default_value
+        assert evaluator.evaluate({"team_path": "team.sales"}).string == default_value
+        assert evaluator.evaluate({"team_path": "team.engineering.platform"}).string == desired_value
+
     def test_in_seg(self):
         segment_key = "segment_key"
 
@@ -0,0 +1,35 @@
+from prefab_cloud_python.evaluation_cache import EvaluationCache
+
+missing = object()
+
+
+class TestEvaluationCache:
+    def test_get_and_set(self):
+        cache = EvaluationCache(2)
+
+        assert cache.get("a", missing) is missing
+        cache.set("a", 1)
+        assert cache.get("a", missing) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 2}
+
+    def test_evicts_least_recently_used(self):
+        cache = EvaluationCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a", missing)
+        cache.set("c", 3)
+
+        assert cache.get("b", missing) is missing
+        assert cache.get("a", missing) == 1
+        assert cache.get("c", missing) == 3
+
+    def test_renewed_keeps_counters_but_drops_entries(self):
+        cache = EvaluationCache(2)
+        cache.set("a", 1)
+        cache.get("a", missing)
+        cache.get("b", missing)
+
+        renewed = cache.renewed()
+
+        assert renewed.get("a", missing) is missing
+        assert renewed.stats() == {"hits": 1, "misses": 2, "size": 0, "max_size": 2}
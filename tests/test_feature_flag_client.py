@@ -1,4 +1,5 @@
 from prefab_cloud_python import Options, Client
+import prefab_pb2 as Prefab
 import pytest
 
 default = "default"
@@ -33,6 +34,47 @@ class TestFeatureFlagClient:
         assert ff_client.get("enabled_flag", default=default)
         assert ff_client.get("flag_with_a_value", default=default) == "all-features"
 
+    def test_get_bulk(self):
+        ff_client = self.build_client()
+
+        assert ff_client.get_bulk("in_lookup_key", ["abc123", "jimmy", "xyz987"]) == [True, False, True]
+        assert ff_client.get_bulk("just_my_domain", ["abc123"], {"domain": "prefab.cloud"}, default=default) == ["new-version"]
+        assert ff_client.get_bulk("something-that-doesnt-exist", ["abc123"], default=default) == [default]
+
+    def test_iter_bulk_matches_get_for_rollouts(self):
+        ff_client = self.build_client()
+        ff_client.base_client.config_client().load_configs(Prefab.Configs(configs=[self.rollout_flag()]), "test")
+        lookup_keys = ["user:%s" % i for i in range(1_000)]
+
+        results = ff_client.iter_bulk("rollout", iter(lookup_keys), chunk_size=64)
+
+        assert list(results) == [ff_client.get("rollout", lookup_key) for lookup_key in lookup_keys]
+        assert set(ff_client.get_bulk("rollout", lookup_keys)) == {"control", "treatment"}
+
+    @staticmethod
+    def rollout_flag():
+        return Prefab.Config(
+            id=1,
+            key="rollout",
+            config_type="FEATURE_FLAG",
+            rows=[
+                Prefab.ConfigRow(
+                    values=[
+                        Prefab.ConditionalValue(
+                            value=Prefab.ConfigValue(
+                                weighted_values=Prefab.WeightedValues(
+                                    weighted_values=[
+                                        Prefab.WeightedValue(weight=500, value=Prefab.ConfigValue(string="control")),
+                                        Prefab.WeightedValue(weight=500, value=Prefab.ConfigValue(string="treatment")),
+                                    ]
+                                )
+                            )
+                        )
+                    ]
+                )
+            ]
+        )
+
     @staticmethod
     def build_client():
         options = Options(
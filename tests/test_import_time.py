@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET_US = 500_000
+NETWORK_MODULES = ["grpc", "urllib3", "prefab_pb2_grpc", "asyncio"]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True,
+        env=os.environ | {"PREFAB_DATASOURCES": "LOCAL_ONLY"},
+    )
+
+
+def cumulative_import_time_us(stderr, module):
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+class TestImportTime:
+    def test_import_stays_within_budget(self):
+        result = run_python("-X", "importtime", "-c", "import prefab_cloud_python")
+
+        assert cumulative_import_time_us(result.stderr, "prefab_cloud_python") < IMPORT_TIME_BUDGET_US
+
+    @pytest.mark.parametrize("code", [
+        "import prefab_cloud_python",
+        "from prefab_cloud_python import Client, Options; "
+        "Client(Options(prefab_config_classpath_dir='tests', prefab_envs=['unit_tests'])).get('sample_int')",
+    ])
+    def test_local_only_does_not_import_network_modules(self, code):
+        result = run_python("-c", f"import sys; {code}; print(','.join(m for m in {NETWORK_MODULES!r} if m in sys.modules))")
+
+        assert result.stdout.strip() == ""
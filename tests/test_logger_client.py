@@ -1,4 +1,4 @@
-from prefab_cloud_python._processors import get_path, get_severity
+from prefab_cloud_python._processors import get_path, get_path_cache_info, get_severity, find_severity
 from prefab_cloud_python import Options, Client
 import prefab_pb2 as Prefab
 import pytest
@@ -21,6 +21,19 @@ class TestLoggerClient:
         assert get_path("/Users/mikowitz/.asdf/installs/python/3.10.7/lib/python3.10/site-packages/my_lib.py", "my_func", "my.prefix") == "my.prefix.my_lib.my_func"
         assert get_path("/Users/mikowitz/Code/my_app/my_app/my_lib.py", "my_func") == "my_app.my_app.my_lib.my_func"
 
+    def test_get_path_only_strips_python_extensions(self):
+        assert get_path("/srv/app/lib/happy.py", "my_func") == "app.lib.happy.my_func"
+        assert get_path("/srv/app/lib/my-lib.pyc", "my_func") == "app.lib.my_lib.my_func"
+        assert get_path("/srv/app/lib/scrappy", "my_func") == "app.lib.scrappy.my_func"
+
+    def test_get_path_is_cached(self):
+        hits = get_path_cache_info().hits
+
+        get_path("/srv/app/lib/cached.py", "my_func")
+        get_path("/srv/app/lib/cached.py", "my_func")
+
+        assert get_path_cache_info().hits == hits + 1
+
     def test_get_severity(self, client):
         config_client = client.config_client()
 
@@ -31,6 +44,25 @@ class TestLoggerClient:
         assert get_severity("app.controller.hello.index", config_client) == Prefab.LogLevel.Value("INFO")
         assert get_severity("app.controller.hello.edit", config_client) == Prefab.LogLevel.Value("WARN")
 
+    def test_get_severity_matches_walking_each_key(self, client):
+        config_client = client.config_client()
+
+        for location in ["", "app", "app.controller.hello", "app.controller.hello.index.extra", "prefab.tests.thing", "other"]:
+            assert get_severity(location, config_client) == find_severity(location, config_client)
+
+    def test_get_severity_is_invalidated_by_updates(self, client):
+        config_client = client.config_client()
+        assert get_severity("app.controller", config_client) == Prefab.LogLevel.Value("ERROR")
+
+        config_client.load_configs(Prefab.Configs(configs=[
+            Prefab.Config(id=1, key="log-level.app.controller", rows=[
+                Prefab.ConfigRow(values=[Prefab.ConditionalValue(value=Prefab.ConfigValue(log_level="DEBUG"))])
+            ])
+        ]), "test")
+
+        assert get_severity("app.controller", config_client) == Prefab.LogLevel.Value("DEBUG")
+        assert get_severity("app.controller.hello", config_client) == Prefab.LogLevel.Value("WARN")
+
     def test_capture_output(self, client, capsys):
         logger = client.logger()
 
@@ -50,6 +82,19 @@ class TestLoggerClient:
         captured = capsys.readouterr()
         assert captured.out == ""
 
+    def test_dropped_logs_skip_the_processor_chain(self, client, capsys):
+        logger = client.logger()
+        client.config_client()
+
+        def unexpected():
+            raise AssertionError("dropped log events should not reach structlog")
+
+        logger.configured_logger = unexpected
+        logger.debug("ok")
+
+        assert capsys.readouterr().out == ""
+        assert get_path(__file__, "test_dropped_logs_skip_the_processor_chain") in logger.locations.values()
+
     def test_log_prefix_from_client(self, capsys):
         options = Options(
             prefab_config_classpath_dir="tests",
@@ -1,5 +1,5 @@
 from prefab_cloud_python import Options
-from prefab_cloud_python.options import MissingApiKeyException, InvalidApiKeyException, InvalidApiUrlException, InvalidGrpcUrlException
+from prefab_cloud_python.options import MissingApiKeyException, InvalidApiKeyException, InvalidApiUrlException, InvalidGrpcUrlException, MissingSharedCacheException
 
 import os
 import pytest
@@ -201,3 +201,27 @@ class TestOptionsOnConnectionFailure:
         with extended_env({"PREFAB_DATASOURCES": "LOCAL_ONLY"}):
             options = Options(on_connection_failure='WHATEVER')
             assert options.on_connection_failure == 'RETURN'
+
+
+class TestOptionsSharedCache:
+    def test_defaults_to_none(self):
+        with extended_env({"PREFAB_DATASOURCES": "LOCAL_ONLY"}):
+            options = Options()
+            assert options.shared_cache is None
+
+    def test_shared_cache_only_needs_no_api_key(self):
+        options = Options(prefab_datasources="SHARED_CACHE", shared_cache="/tmp/prefab.snapshot")
+        assert options.is_shared_cache_only()
+        assert options.shared_cache == "/tmp/prefab.snapshot"
+        assert options.api_key is None
+        assert options.url_for_api_cdn is None
+
+    def test_shared_cache_from_env(self):
+        with extended_env({"PREFAB_DATASOURCES": "SHARED_CACHE", "PREFAB_SHARED_CACHE": "/tmp/prefab.snapshot"}):
+            options = Options()
+            assert options.is_shared_cache_only()
+            assert options.shared_cache == "/tmp/prefab.snapshot"
+
+    def test_shared_cache_only_requires_a_path(self):
+        with pytest.raises(MissingSharedCacheException):
+            Options(prefab_datasources="SHARED_CACHE")
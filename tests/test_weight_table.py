@@ -0,0 +1,49 @@
+from prefab_cloud_python.weighted_value_resolver import WeightTable
+from hypothesis import strategies
+import hypothesis
+import prefab_pb2 as Prefab
+
+key = "config_key"
+weight_lists = strategies.lists(strategies.integers(min_value=0, max_value=1000), min_size=1, max_size=20)
+
+
+class TestWeightTable:
+    @hypothesis.given(weights=weight_lists, percent=strategies.floats(min_value=0, max_value=1))
+    def test_variant_index_matches_linear_scan(self, weights, percent):
+        table = WeightTable(self.build_weighted_values(weights), key)
+
+        assert table.variant_index(percent) == self.linear_variant_index(weights, percent)
+
+    @hypothesis.given(weights=weight_lists, lookup_key=strategies.text())
+    def test_resolve_matches_linear_scan(self, weights, lookup_key):
+        weighted_values = self.build_weighted_values(weights)
+        table = WeightTable(weighted_values, key)
+        percent = table.user_percent(lookup_key)
+
+        assert table.resolve(lookup_key) == weighted_values[self.linear_variant_index(weights, percent)]
+
+    @hypothesis.given(weights=weight_lists, lookup_keys=strategies.lists(strategies.text(), max_size=50))
+    def test_resolve_many_matches_resolve(self, weights, lookup_keys):
+        table = WeightTable(self.build_weighted_values(weights), key)
+
+        assert table.resolve_many(lookup_keys) == [table.resolve(lookup_key) for lookup_key in lookup_keys]
+
+    # The algorithm WeightTable replaced; results must stay bit-identical to it.
+    @staticmethod
+    def linear_variant_index(weights, percent):
+        bucket = sum(weights) * percent
+
+        bucket_sum = 0
+        for (index, weight) in enumerate(weights):
+            if bucket < bucket_sum + weight:
+                return index
+            bucket_sum += weight
+
+        return len(weights) - 1
+
+    @staticmethod
+    def build_weighted_values(weights):
+        return [
+            Prefab.WeightedValue(value=Prefab.ConfigValue(string="variant-%s" % index), weight=weight)
+            for (index, weight) in enumerate(weights)
+        ]
@@ -1,3 +1,4 @@
+from prefab_cloud_python import weighted_value_resolver
 from prefab_cloud_python.weighted_value_resolver import WeightedValueResolver
 import prefab_pb2 as Prefab
 import pytest
@@ -46,6 +47,21 @@ class TestWeightedValueResolver:
         assert results["def"] == pytest.approx(9800, 50)
         assert results["ghi"] == pytest.approx(100, 20)
 
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_resolve_many_matches_resolve(self, numpy_available, monkeypatch):
+        if not numpy_available:
+            monkeypatch.setattr(weighted_value_resolver, "numpy_or_none", lambda: None)
+        elif weighted_value_resolver.numpy_or_none() is None:
+            pytest.skip("numpy is not installed")
+        weighted_values = self.build_weighted_values({"abc": 1, "def": 98, "ghi": 1, "jkl": 0, "mno": 3})
+        lookup_keys = ["user:%s" % i for i in range(2_000)]
+
+        resolved = WeightedValueResolver.resolve_many(weighted_values, key, lookup_keys)
+
+        assert [r.value.string for r in resolved] == [
+            WeightedValueResolver(weighted_values, key, lookup_key).resolve().value.string for lookup_key in lookup_keys
+        ]
+
     @staticmethod
     def build_weighted_values(values_and_weights):
         weighted_values = []
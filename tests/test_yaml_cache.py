@@ -0,0 +1,60 @@
+from prefab_cloud_python import Options, Client
+from prefab_cloud_python.yaml_cache import YamlCache
+from prefab_cloud_python.yaml_parser import YamlParser
+import os
+import pytest
+
+
+class TestYamlCache:
+    def test_matches_uncached_parse(self, tmp_path):
+        cache = YamlCache(str(tmp_path / "cache"))
+
+        compiled = YamlParser("tests/.prefab.unit_tests.config.yaml", cache).data
+        cached = YamlParser("tests/.prefab.unit_tests.config.yaml", cache).data
+
+        assert compiled == YamlParser("tests/.prefab.unit_tests.config.yaml").data
+        assert cached == compiled
+
+    def test_reuses_compiled_configs(self, tmp_path, monkeypatch):
+        yaml_file = self.write_yaml(tmp_path, "sample: one\n")
+        cache = YamlCache(str(tmp_path / "cache"))
+        YamlParser(yaml_file, cache).data
+
+        monkeypatch.setattr(YamlParser, "parse_bytes", self.unexpected_parse)
+        assert YamlParser(yaml_file, cache).data["sample"]["config"].rows[0].values[0].value.string == "one"
+
+        stat = os.stat(yaml_file)
+        os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert YamlParser(yaml_file, cache).data["sample"]["config"].rows[0].values[0].value.string == "one"
+
+    def test_rebuilds_when_yaml_changes(self, tmp_path):
+        yaml_file = self.write_yaml(tmp_path, "sample: one\n")
+        cache = YamlCache(str(tmp_path / "cache"))
+        YamlParser(yaml_file, cache).data
+
+        self.write_yaml(tmp_path, "sample: two\nother: 3\n")
+
+        data = YamlParser(yaml_file, cache).data
+        assert data["sample"]["config"].rows[0].values[0].value.string == "two"
+        assert data["other"]["config"].rows[0].values[0].value.int == 3
+
+    def test_client_with_yaml_cache_dir(self, tmp_path):
+        options = Options(
+            prefab_config_classpath_dir="tests",
+            prefab_envs=["unit_tests"],
+            prefab_datasources="LOCAL_ONLY",
+            yaml_cache_dir=str(tmp_path),
+        )
+
+        assert Client(options).get("sample_int") == 123
+        assert len(os.listdir(tmp_path)) > 0
+
+    @staticmethod
+    def write_yaml(tmp_path, contents):
+        path = tmp_path / ".prefab.default.config.yaml"
+        path.write_text(contents)
+        return str(path)
+
+    @staticmethod
+    def unexpected_parse(*_args):
+        pytest.fail("compiled YAML should have been reused")